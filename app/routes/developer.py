@@ -47,6 +47,7 @@ def get_env_configuration():
         ('ALIGNMENT_TOLERANCE_PX', {'category': 'Alignment', 'required': False, 'description': 'Alignment tolerance in pixels'}),
         ('ALIGNMENT_MAX_ATTEMPTS', {'category': 'Alignment', 'required': False, 'description': 'Maximum alignment verification attempts'}),
         ('EMAIL_MAX_RETRIES', {'category': 'Alignment', 'required': False, 'description': 'Maximum email send retries'}),
+        ('EMAIL_MAX_WORKERS', {'category': 'Alignment', 'required': False, 'description': 'Concurrent SMTP sends for bulk jobs'}),
         ('FIELD_POSITION_TOLERANCE_PX', {'category': 'Alignment', 'required': False, 'description': 'Field position tolerance in pixels'}),
     ])
     
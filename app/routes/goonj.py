@@ -1,6 +1,6 @@
 """GOONJ certificate generation routes."""
 from flask import Blueprint, request, jsonify, send_file, current_app, render_template, url_for, session
-from app.utils.goonj_renderer import GOONJRenderer
+from app.utils.goonj_renderer import GOONJRenderer, POSITIONS_SUFFIX
 from app.utils.mail import send_goonj_certificate
 from app.utils.alignment_checker import (
     verify_certificate_alignment,
@@ -249,7 +249,15 @@ def generate_certificate():
         # Ensure output_folder is an absolute path
         if not os.path.isabs(output_folder):
             output_folder = os.path.abspath(output_folder)
-        renderer = GOONJRenderer(template_path, output_folder)
+        renderer = GOONJRenderer(
+            template_path,
+            output_folder,
+            png_compress_level=current_app.config.get('PNG_COMPRESS_LEVEL', 1),
+            cache_dir=current_app.config.get('RENDER_CACHE_FOLDER') or None,
+            cache_max_entries=current_app.config.get('RENDER_CACHE_MAX_ENTRIES', 1000),
+            # Drawn positions let DEBUG_VALIDATE skip OCR
+            write_positions=current_app.config.get('DEBUG_VALIDATE', False)
+        )
         
         # Generate certificate
         cert_path = renderer.render(participant_data, output_format=output_format)
@@ -321,6 +329,8 @@ def generate_certificate():
                         if os.path.exists(cert_path_abs):
                             try:
                                 os.remove(cert_path_abs)
+                                if os.path.exists(cert_path_abs + POSITIONS_SUFFIX):
+                                    os.remove(cert_path_abs + POSITIONS_SUFFIX)
                             except Exception as e:
                                 logger.warning(f"Could not remove old certificate: {e}")
                         
@@ -372,6 +382,8 @@ def generate_certificate():
                             # Clean up the failed certificate
                             try:
                                 os.remove(cert_path_abs)
+                                if os.path.exists(cert_path_abs + POSITIONS_SUFFIX):
+                                    os.remove(cert_path_abs + POSITIONS_SUFFIX)
                                 logger.info(f"Removed failed certificate: {cert_path_abs}")
                             except Exception as cleanup_error:
                                 logger.warning(f"Could not remove failed certificate: {cleanup_error}")
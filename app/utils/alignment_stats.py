@@ -6,7 +6,10 @@ monitor performance, and enable data-driven optimization.
 """
 import os
 import json
+import queue
+import atexit
 import logging
+import threading
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from collections import defaultdict
@@ -15,7 +18,11 @@ logger = logging.getLogger(__name__)
 
 
 class AlignmentStats:
-    """Track and analyze alignment verification statistics."""
+    """Track and analyze alignment verification statistics.
+    
+    record_verification may run on the background writer thread, so every
+    read and write of self.stats holds self._lock.
+    """
     
     def __init__(self, stats_file: str = 'alignment_stats.json'):
         """
@@ -25,6 +32,7 @@ class AlignmentStats:
             stats_file: Path to statistics file
         """
         self.stats_file = stats_file
+        self._lock = threading.RLock()
         self.stats = self._load_stats()
     
     def _load_stats(self) -> Dict[str, Any]:
@@ -62,16 +70,28 @@ class AlignmentStats:
                 'records': []
             }
     
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return a copy of the statistics that later records will not change.
+        
+        Returns:
+            Statistics dictionary with plain dicts and a copied records list
+        """
+        with self._lock:
+            # Convert defaultdict to regular dict for JSON serialization
+            data = dict(self.stats)
+            data['attempts_histogram'] = dict(self.stats['attempts_histogram'])
+            data['field_failures'] = dict(self.stats['field_failures'])
+            data['records'] = list(self.stats['records'])
+            return data
+    
     def _save_stats(self):
         """Save statistics to file."""
         try:
-            # Convert defaultdict to regular dict for JSON serialization
-            save_data = dict(self.stats)
-            save_data['attempts_histogram'] = dict(self.stats['attempts_histogram'])
-            save_data['field_failures'] = dict(self.stats['field_failures'])
-            
-            with open(self.stats_file, 'w') as f:
-                json.dump(save_data, f, indent=2)
+            with self._lock:
+                save_data = self.snapshot()
+                with open(self.stats_file, 'w') as f:
+                    json.dump(save_data, f, indent=2)
             logger.debug(f"Saved alignment statistics to {self.stats_file}")
         except Exception as e:
             logger.error(f"Could not save alignment statistics: {e}")
@@ -96,58 +116,74 @@ class AlignmentStats:
             tolerance_px: Tolerance used
             participant_data: Optional participant data
         """
-        self.stats['total_verifications'] += 1
-        
-        if passed:
-            self.stats['successful_verifications'] += 1
-        else:
-            self.stats['failed_verifications'] += 1
-        
-        # Update attempts histogram
-        attempts_key = str(attempts)
-        self.stats['attempts_histogram'][attempts_key] += 1
-        
-        # Track field failures
-        for field_name, field_diff in field_differences.items():
-            if 'error' in field_diff or field_diff.get('y_diff', 0) > tolerance_px or field_diff.get('x_diff', 0) > tolerance_px:
-                self.stats['field_failures'][field_name] += 1
-        
-        # Update average attempts
-        total = self.stats['total_verifications']
-        current_avg = self.stats['average_attempts']
-        self.stats['average_attempts'] = (current_avg * (total - 1) + attempts) / total
-        
-        # Store record (keep last 100)
-        record = {
-            'timestamp': datetime.now().isoformat(),
-            'passed': passed,
-            'attempts': attempts,
-            'max_difference_px': max_difference_px,
-            'tolerance_px': tolerance_px,
-            'field_count': len([f for f in field_differences.values() if 'error' not in f])
-        }
-        
-        if participant_data:
-            # Store text lengths for pattern analysis
-            record['text_lengths'] = {
-                'name': len(str(participant_data.get('name', ''))),
-                'event': len(str(participant_data.get('event', ''))),
-                'organiser': len(str(participant_data.get('organiser', '')))
+        with self._lock:
+            self.stats['total_verifications'] += 1
+            
+            if passed:
+                self.stats['successful_verifications'] += 1
+            else:
+                self.stats['failed_verifications'] += 1
+            
+            # Update attempts histogram
+            attempts_key = str(attempts)
+            self.stats['attempts_histogram'][attempts_key] += 1
+            
+            # Track field failures
+            for field_name, field_diff in field_differences.items():
+                if 'error' in field_diff or field_diff.get('y_diff', 0) > tolerance_px or field_diff.get('x_diff', 0) > tolerance_px:
+                    self.stats['field_failures'][field_name] += 1
+            
+            # Update average attempts
+            total = self.stats['total_verifications']
+            current_avg = self.stats['average_attempts']
+            self.stats['average_attempts'] = (current_avg * (total - 1) + attempts) / total
+            
+            # Store record (keep last 100)
+            record = {
+                'timestamp': datetime.now().isoformat(),
+                'passed': passed,
+                'attempts': attempts,
+                'max_difference_px': max_difference_px,
+                'tolerance_px': tolerance_px,
+                'field_count': len([f for f in field_differences.values() if 'error' not in f])
             }
-        
-        self.stats['records'].append(record)
-        
-        # Keep only last 100 records
-        if len(self.stats['records']) > 100:
-            self.stats['records'] = self.stats['records'][-100:]
-        
-        self._save_stats()
+            
+            if participant_data:
+                # Store text lengths for pattern analysis
+                record['text_lengths'] = {
+                    'name': len(str(participant_data.get('name', ''))),
+                    'event': len(str(participant_data.get('event', ''))),
+                    'organiser': len(str(participant_data.get('organiser', '')))
+                }
+            
+            self.stats['records'].append(record)
+            
+            # Keep only last 100 records
+            if len(self.stats['records']) > 100:
+                self.stats['records'] = self.stats['records'][-100:]
+            
+            self._save_stats()
         
         logger.info(
             f"Recorded verification: passed={passed}, attempts={attempts}, "
             f"max_diff={max_difference_px:.4f}px"
         )
     
+    def record_verification_async(self, **kwargs):
+        """
+        Queue a verification record for the background writer thread.
+        
+        Takes the same keyword arguments as record_verification, which runs
+        later on the writer thread so the stats file is not rewritten on the
+        caller's path. Call flush() to wait for queued records.
+        """
+        _start_stats_writer()
+        _stats_queue.put((self, kwargs))
+    
+    def flush(self):
+        """Block until every queued verification record has been written."""
+        _stats_queue.join()
+    
     def get_summary(self) -> Dict[str, Any]:
         """
         Get summary statistics.
@@ -155,44 +191,45 @@ class AlignmentStats:
         Returns:
             Dictionary with summary statistics
         """
-        total = self.stats['total_verifications']
-        
-        if total == 0:
+        with self._lock:
+            total = self.stats['total_verifications']
+            
+            if total == 0:
+                return {
+                    'total_verifications': 0,
+                    'success_rate': 0.0,
+                    'average_attempts': 0.0,
+                    'most_common_attempts': None,
+                    'problem_fields': []
+                }
+            
+            success_rate = self.stats['successful_verifications'] / total * 100
+            
+            # Find most common number of attempts
+            most_common_attempts = None
+            if self.stats['attempts_histogram']:
+                most_common_attempts = max(
+                    self.stats['attempts_histogram'].items(),
+                    key=lambda x: x[1]
+                )[0]
+            
+            # Identify problem fields (fields that fail most often)
+            problem_fields = sorted(
+                self.stats['field_failures'].items(),
+                key=lambda x: x[1],
+                reverse=True
+            )[:3]  # Top 3 problem fields
+            
             return {
-                'total_verifications': 0,
-                'success_rate': 0.0,
-                'average_attempts': 0.0,
-                'most_common_attempts': None,
-                'problem_fields': []
+                'total_verifications': total,
+                'successful_verifications': self.stats['successful_verifications'],
+                'failed_verifications': self.stats['failed_verifications'],
+                'success_rate': success_rate,
+                'average_attempts': self.stats['average_attempts'],
+                'most_common_attempts': int(most_common_attempts) if most_common_attempts else None,
+                'problem_fields': [{'field': f, 'failures': c} for f, c in problem_fields],
+                'attempts_distribution': dict(self.stats['attempts_histogram'])
             }
-        
-        success_rate = self.stats['successful_verifications'] / total * 100
-        
-        # Find most common number of attempts
-        most_common_attempts = None
-        if self.stats['attempts_histogram']:
-            most_common_attempts = max(
-                self.stats['attempts_histogram'].items(),
-                key=lambda x: x[1]
-            )[0]
-        
-        # Identify problem fields (fields that fail most often)
-        problem_fields = sorted(
-            self.stats['field_failures'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:3]  # Top 3 problem fields
-        
-        return {
-            'total_verifications': total,
-            'successful_verifications': self.stats['successful_verifications'],
-            'failed_verifications': self.stats['failed_verifications'],
-            'success_rate': success_rate,
-            'average_attempts': self.stats['average_attempts'],
-            'most_common_attempts': int(most_common_attempts) if most_common_attempts else None,
-            'problem_fields': [{'field': f, 'failures': c} for f, c in problem_fields],
-            'attempts_distribution': dict(self.stats['attempts_histogram'])
-        }
     
     def get_recommendations(self) -> List[str]:
         """
@@ -257,19 +294,50 @@ class AlignmentStats:
     
     def reset(self):
         """Reset all statistics."""
-        self.stats = {
-            'total_verifications': 0,
-            'successful_verifications': 0,
-            'failed_verifications': 0,
-            'attempts_histogram': defaultdict(int),
-            'field_failures': defaultdict(int),
-            'average_attempts': 0.0,
-            'records': []
-        }
-        self._save_stats()
+        with self._lock:
+            self.stats = {
+                'total_verifications': 0,
+                'successful_verifications': 0,
+                'failed_verifications': 0,
+                'attempts_histogram': defaultdict(int),
+                'field_failures': defaultdict(int),
+                'average_attempts': 0.0,
+                'records': []
+            }
+            self._save_stats()
         logger.info("Reset alignment statistics")
 
 
+# Records queued by record_verification_async, written by one daemon thread
+_stats_queue = queue.Queue()
+_stats_writer = None
+_stats_writer_lock = threading.Lock()
+
+
+def _start_stats_writer():
+    """Start the background stats writer on first use."""
+    global _stats_writer
+    with _stats_writer_lock:
+        if _stats_writer is None:
+            _stats_writer = threading.Thread(
+                target=_write_queued_stats, name='alignment-stats-writer', daemon=True
+            )
+            _stats_writer.start()
+            # Write out anything still queued before the interpreter exits
+            atexit.register(_stats_queue.join)
+
+
+def _write_queued_stats():
+    while True:
+        stats, kwargs = _stats_queue.get()
+        try:
+            stats.record_verification(**kwargs)
+        except Exception as e:
+            logger.error(f"Could not record alignment statistics: {e}")
+        finally:
+            _stats_queue.task_done()
+
+
 # Global stats instance
 _alignment_stats = None
 
@@ -75,8 +75,8 @@ def regenerate_reference_certificate(template_path, output_folder='generated_cer
     generated_img = Image.open(cert_path)
     
     # Use numpy for efficient array comparison
-    ref_arr = np.array(reference_img)
-    gen_arr = np.array(generated_img)
+    ref_arr = np.asarray(reference_img)
+    gen_arr = np.asarray(generated_img)
     
     if np.array_equal(ref_arr, gen_arr):
         logger.info("✅ VERIFIED: New reference is pixel-perfect match")
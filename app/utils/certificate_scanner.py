@@ -15,26 +15,47 @@ Features:
 - Smart field matching and replacement
 """
 
+import io
 import os
+import re
 import json
 import cv2
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields as dataclass_fields
+from functools import lru_cache
 from datetime import datetime
 import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageStat
 import pytesseract
 from pdf2image import convert_from_path
 import logging
+from .text_align import get_font
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@lru_cache(maxsize=1)
+def _tesseract_available() -> bool:
+    """Check for the Tesseract binary once per process.
+    
+    get_tesseract_version() starts a subprocess on every call, so the result
+    is cached instead of re-checked by every CertificateScanner.
+    """
+    try:
+        pytesseract.get_tesseract_version()
+        return True
+    except pytesseract.TesseractNotFoundError:
+        logger.warning("Tesseract OCR not found. Some features may be limited.")
+        return False
+
+
+@dataclass(slots=True)
 class DetectedField:
     """Represents a detected text field on a certificate."""
     text: str
@@ -49,11 +70,15 @@ class DetectedField:
     field_type: str  # "placeholder" or "static"
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary.
+        
+        All values are immutable scalars, so a shallow field copy gives the
+        same result as dataclasses.asdict without its recursive deepcopy.
+        """
+        return {f.name: getattr(self, f.name) for f in dataclass_fields(self)}
 
 
-@dataclass
+@dataclass(slots=True)
 class TemplateAnalysis:
     """Analysis result of a scanned certificate template."""
     width: int  # Template width in pixels
@@ -66,9 +91,14 @@ class TemplateAnalysis:
     scan_timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary."""
-        data = asdict(self)
+        """Convert to dictionary.
+        
+        Builds each field's dict once; asdict() would deep-copy every
+        DetectedField and the result was then converted a second time.
+        """
+        data = {f.name: getattr(self, f.name) for f in dataclass_fields(self)}
         data['detected_fields'] = [f.to_dict() for f in self.detected_fields]
+        data['text_regions'] = [dict(region) for region in self.text_regions]
         return data
 
 
@@ -85,24 +115,41 @@ class CertificateScanner:
         'organization': ['organization', 'institution', 'presented by', 'organization'],
     }
     
-    def __init__(self, dpi: int = 300, ocr_lang: str = 'eng'):
+    # Keywords that mark text as static certificate wording
+    STATIC_KEYWORDS = ['certificate', 'achievement', 'recognized', 'completed',
+                       'hereby', 'awarded', 'successfully']
+    
+    # Each keyword list compiled once into a single literal alternation, so a
+    # text is scanned in one pass instead of once per keyword
+    _PLACEHOLDER_RE = re.compile('|'.join(
+        re.escape(keyword) for keywords in COMMON_PLACEHOLDERS.values() for keyword in keywords
+    ))
+    _STATIC_RE = re.compile('|'.join(re.escape(keyword) for keyword in STATIC_KEYWORDS))
+    
+    # Tesseract options: skip the extra pass over inverted (light-on-dark) text
+    OCR_CONFIG = '-c tessedit_do_invert=0'
+    
+    def __init__(self, dpi: int = 300, ocr_lang: str = 'eng', ocr_dpi: Optional[int] = 150):
         """
         Initialize the certificate scanner.
         
         Args:
             dpi: DPI for image processing (affects accuracy)
             ocr_lang: OCR language (default: English)
+            ocr_dpi: Resolution OCR runs at (default: 150). Images are
+                downscaled by ocr_dpi/dpi before Tesseract, whose runtime
+                scales with pixel count while accuracy plateaus around
+                150 DPI; positions are mapped back to full resolution.
+                None (or a value >= dpi) OCRs at full resolution.
         """
         self.dpi = dpi
         self.ocr_lang = ocr_lang
+        self.ocr_dpi = ocr_dpi
         self._check_dependencies()
     
     def _check_dependencies(self):
         """Verify required dependencies are installed."""
-        try:
-            pytesseract.get_tesseract_version()
-        except pytesseract.TesseractNotFoundError:
-            logger.warning("Tesseract OCR not found. Some features may be limited.")
+        _tesseract_available()
     
     def scan_certificate(self, certificate_path: str) -> TemplateAnalysis:
         """
@@ -115,7 +162,75 @@ class CertificateScanner:
             TemplateAnalysis with detected fields and metadata
         """
         logger.info(f"Scanning certificate: {certificate_path}")
+        image = self._load_image(certificate_path)
+        return self._analyze_image(image)
+    
+    def scan_certificates(self, certificate_paths: List[str]) -> List[TemplateAnalysis]:
+        """
+        Scan several certificate templates with a single Tesseract run.
+        
+        Tesseract is started once with a list file naming every page, so its
+        language model is loaded once per batch instead of once per
+        certificate. Falls back to scanning each file separately if the
+        batch run fails.
         
+        Args:
+            certificate_paths: Paths to certificate templates (PDF/PNG/JPG)
+        
+        Returns:
+            List of TemplateAnalysis, in the same order as certificate_paths
+        """
+        logger.info(f"Scanning {len(certificate_paths)} certificates in one OCR batch")
+        images = [self._load_image(path) for path in certificate_paths]
+        
+        try:
+            ocr_pages = self._ocr_batch(images, certificate_paths)
+        except (OSError, subprocess.SubprocessError, pytesseract.TesseractNotFoundError) as e:
+            logger.warning(f"Batch OCR failed ({e}), scanning certificates one by one")
+            ocr_pages = [None] * len(images)
+        
+        return [self._analyze_image(image, data) for image, data in zip(images, ocr_pages)]
+    
+    def scan_many(self, certificate_paths: List[str], workers: Optional[int] = None,
+                  chunk_size: int = 4) -> List[TemplateAnalysis]:
+        """
+        Scan many certificates across worker processes.
+        
+        Several single-threaded Tesseract processes outperform one process
+        using OpenMP threads, so each worker runs Tesseract with
+        OMP_THREAD_LIMIT=1 and OCRs its chunk of paths in one batch (see
+        scan_certificates).
+        
+        Args:
+            certificate_paths: Paths to certificate templates (PDF/PNG/JPG)
+            workers: Number of worker processes (default: os.cpu_count())
+            chunk_size: Certificates per Tesseract batch in a worker
+        
+        Returns:
+            List of TemplateAnalysis, in the same order as certificate_paths
+        """
+        certificate_paths = list(certificate_paths)
+        workers = min(workers or os.cpu_count() or 1, len(certificate_paths))
+        if workers <= 1:
+            return self.scan_certificates(certificate_paths) if certificate_paths else []
+        
+        chunks = [
+            certificate_paths[i:i + chunk_size]
+            for i in range(0, len(certificate_paths), chunk_size)
+        ]
+        results = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_scan_worker,
+            initargs=(self.dpi, self.ocr_lang, self.ocr_dpi,
+                      pytesseract.pytesseract.tesseract_cmd)
+        ) as executor:
+            for analyses in executor.map(_scan_chunk, chunks):
+                results.extend(analyses)
+        return results
+    
+    def _load_image(self, certificate_path: str) -> Image.Image:
+        """Load a certificate (first page for PDFs) as an RGB image."""
         # Convert to image if PDF
         if certificate_path.lower().endswith('.pdf'):
             image = self._pdf_to_image(certificate_path)
@@ -126,11 +241,74 @@ class CertificateScanner:
         if image.mode != 'RGB':
             image = image.convert('RGB')
         
+        return image
+    
+    def _ocr_size(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        """Return the pixel size an image of the given size is OCR'd at."""
+        if not self.ocr_dpi or self.ocr_dpi >= self.dpi:
+            return size
+        scale = self.ocr_dpi / self.dpi
+        return (max(1, int(size[0] * scale)), max(1, int(size[1] * scale)))
+    
+    def _ocr_image(self, image: Image.Image) -> Image.Image:
+        """Downscale an image to the OCR resolution (see ocr_dpi)."""
+        ocr_size = self._ocr_size(image.size)
+        if ocr_size == image.size:
+            return image
+        return image.resize(ocr_size, Image.LANCZOS)
+    
+    def _ocr_batch(self, images: List[Image.Image], paths: List[str]) -> List[Dict]:
+        """
+        Run Tesseract once over all images and split its TSV output per page.
+        
+        Images already stored on disk as RGB PNG/JPEG at OCR resolution are
+        passed by path; others are downscaled and written to temporary PNGs.
+        
+        Returns:
+            One image_to_data-style dict per image
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            page_paths = []
+            for i, (image, path) in enumerate(zip(images, paths)):
+                ocr_image = self._ocr_image(image)
+                if getattr(ocr_image, 'format', None) in ('PNG', 'JPEG'):
+                    page_paths.append(os.path.abspath(path))
+                else:
+                    page_path = os.path.join(tmpdir, f"page_{i}.png")
+                    ocr_image.save(page_path, 'PNG', compress_level=1)
+                    page_paths.append(page_path)
+            
+            list_path = os.path.join(tmpdir, 'pages.txt')
+            with open(list_path, 'w') as f:
+                f.write('\n'.join(page_paths) + '\n')
+            
+            result = subprocess.run(
+                [pytesseract.pytesseract.tesseract_cmd, list_path, 'stdout',
+                 '-l', self.ocr_lang, '-c', 'tessedit_create_tsv=1',
+                 *self.OCR_CONFIG.split(), 'tsv'],
+                capture_output=True, check=True
+            )
+        
+        data = pytesseract.pytesseract.file_to_dict(
+            result.stdout.decode('utf-8', errors='replace'), '\t', -1
+        )
+        
+        # Rows carry a 1-based page_num, one page per list entry
+        pages = [{key: [] for key in data} for _ in images]
+        for row, page_num in enumerate(data.get('page_num', [])):
+            if isinstance(page_num, int) and 1 <= page_num <= len(pages):
+                page = pages[page_num - 1]
+                for key, values in data.items():
+                    page[key].append(values[row])
+        return pages
+    
+    def _analyze_image(self, image: Image.Image, ocr_data: Optional[Dict] = None) -> TemplateAnalysis:
+        """Analyze a loaded RGB certificate image, optionally with OCR data already run."""
         # Get basic info
         width, height = image.size
         
         # Detect text fields
-        detected_fields = self._detect_fields(image)
+        detected_fields = self._detect_fields(image, ocr_data)
         
         # Detect background color
         bg_color = self._detect_background_color(image)
@@ -153,25 +331,61 @@ class CertificateScanner:
         return analysis
     
     def _pdf_to_image(self, pdf_path: str, page: int = 0) -> Image.Image:
-        """Convert PDF page to PIL Image."""
+        """Convert PDF page to PIL Image.
+        
+        Runs pdftoppm once and reads the page as an uncompressed PPM from its
+        stdout. pdf2image's convert_from_path would first run pdfinfo and
+        pdftoppm -v, three poppler processes per page; it is kept as the
+        fallback.
+        """
         logger.info(f"Converting PDF page {page} to image")
+        try:
+            result = subprocess.run(
+                ['pdftoppm', '-r', str(self.dpi), '-f', str(page + 1), '-l', str(page + 1),
+                 '-singlefile', pdf_path],
+                capture_output=True, check=True
+            )
+            if result.stdout:
+                image = Image.open(io.BytesIO(result.stdout))
+                image.load()
+                return image
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"pdftoppm failed ({e}), falling back to pdf2image")
+        
         images = convert_from_path(pdf_path, dpi=self.dpi, first_page=page+1, last_page=page+1)
         return images[0] if images else Image.new('RGB', (800, 600))
     
-    def _detect_fields(self, image: Image.Image) -> List[DetectedField]:
+    def _detect_fields(self, image: Image.Image, data: Optional[Dict] = None) -> List[DetectedField]:
         """
         Detect text fields in the certificate image using OCR and image analysis.
+        
+        Args:
+            image: RGB certificate image
+            data: Pre-computed image_to_data dict (e.g. from a batch OCR run);
+                Tesseract is run on the image when omitted
         """
         fields = []
         
         # Use Tesseract OCR to detect text regions
         try:
             # Get detailed OCR results
-            data = pytesseract.image_to_data(image, lang=self.ocr_lang, output_type=pytesseract.Output.DICT)
+            if data is None:
+                data = pytesseract.image_to_data(
+                    self._ocr_image(image), lang=self.ocr_lang, config=self.OCR_CONFIG,
+                    output_type=pytesseract.Output.DICT
+                )
             
             # Process detected text regions
             width, height = image.size
             
+            # Materialize the pixels once; per-token color detection slices views
+            pixels = np.asarray(image)
+            
+            # OCR boxes are in OCR-resolution pixels; scale back to the image
+            ocr_width, ocr_height = self._ocr_size(image.size)
+            scale_x = width / ocr_width
+            scale_y = height / ocr_height
+            
             for i in range(len(data['text'])):
                 text = data['text'][i].strip()
                 confidence = int(data['conf'][i]) / 100.0
@@ -181,10 +395,10 @@ class CertificateScanner:
                     continue
                 
                 # Extract position and size
-                left = data['left'][i]
-                top = data['top'][i]
-                w = data['width'][i]
-                h = data['height'][i]
+                left = round(data['left'][i] * scale_x)
+                top = round(data['top'][i] * scale_y)
+                w = round(data['width'][i] * scale_x)
+                h = round(data['height'][i] * scale_y)
                 
                 # Normalize coordinates (0-1)
                 x_norm = (left + w/2) / width
@@ -196,7 +410,7 @@ class CertificateScanner:
                 font_size = max(8, int(h * 0.5))
                 
                 # Detect text color
-                text_color = self._detect_text_color(image, left, top, w, h)
+                text_color = self._detect_text_color(pixels, left, top, w, h)
                 
                 # Determine alignment (simple heuristic)
                 alignment = self._determine_alignment(image, left, w, width)
@@ -230,17 +444,22 @@ class CertificateScanner:
         
         return fields
     
-    def _detect_text_color(self, image: Image.Image, x: int, y: int, w: int, h: int) -> str:
-        """Detect the dominant color of text in a region."""
+    def _detect_text_color(self, pixels: np.ndarray, x: int, y: int, w: int, h: int) -> str:
+        """Detect the dominant color of text in a region.
+        
+        Args:
+            pixels: Whole-image RGB array (H x W x 3); the region is sliced
+                out as a view rather than cropped and copied
+            x, y, w, h: Text box in pixels
+        """
         try:
-            # Crop region around text
-            region = image.crop((max(0, x-5), max(0, y-5), 
-                               min(image.width, x+w+5), min(image.height, y+h+5)))
+            # Region around text
+            img_height, img_width = pixels.shape[:2]
+            region = pixels[max(0, y-5):min(img_height, y+h+5), max(0, x-5):min(img_width, x+w+5)]
             
             # Get dominant color
-            colors = region.getcolors(maxcolors=region.width * region.height)
-            if colors:
-                dominant_color = max(colors, key=lambda x: x[0])[1]
+            dominant_color = self._dominant_color(region)
+            if dominant_color is not None:
                 return self._rgb_to_hex(dominant_color)
         except Exception as e:
             logger.debug(f"Color detection error: {e}")
@@ -266,14 +485,11 @@ class CertificateScanner:
         text_lower = text.lower()
         
         # Check against common placeholders
-        for field_type, keywords in self.COMMON_PLACEHOLDERS.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return "placeholder"
+        if self._PLACEHOLDER_RE.search(text_lower):
+            return "placeholder"
         
         # If text matches common certificate keywords, it's static
-        static_keywords = ['certificate', 'achievement', 'recognized', 'completed', 
-                          'hereby', 'awarded', 'successfully']
-        if any(keyword in text_lower for keyword in static_keywords):
+        if self._STATIC_RE.search(text_lower):
             return "static"
         
         # If very short and centered, likely a placeholder
@@ -283,40 +499,57 @@ class CertificateScanner:
         return "static"
     
     def _deduplicate_fields(self, fields: List[DetectedField]) -> List[DetectedField]:
-        """Remove duplicate or very close fields."""
+        """Remove duplicate or very close fields.
+        
+        A field is a duplicate of the earliest kept field lying within 0.05 in
+        both x and y; the higher-confidence one of the two is kept. Kept fields
+        are bucketed on a 0.05 grid, so each field is compared only against the
+        3x3 neighbouring cells instead of every kept field.
+        """
         if not fields:
             return fields
         
-        deduplicated = []
-        for field in fields:
-            # Check if similar field already exists
-            is_duplicate = False
-            for existing in deduplicated:
-                # If position is very close, it's a duplicate
-                if (abs(field.x - existing.x) < 0.05 and 
-                    abs(field.y - existing.y) < 0.05):
-                    # Keep field with higher confidence
-                    if field.confidence > existing.confidence:
-                        deduplicated.remove(existing)
-                    else:
-                        is_duplicate = True
-                    break
+        cell_size = 0.05
+        grid = {}  # (cell_x, cell_y) -> [(order, field), ...]
+        kept = {}  # order -> field, in kept-list order
+        for order, field in enumerate(fields):
+            cell = (int(field.x // cell_size), int(field.y // cell_size))
+            
+            # Find the earliest kept field that is very close
+            match = None
+            match_cell = None
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    neighbour = (cell[0] + dx, cell[1] + dy)
+                    for entry in grid.get(neighbour, ()):
+                        existing = entry[1]
+                        if (abs(field.x - existing.x) < cell_size and
+                                abs(field.y - existing.y) < cell_size and
+                                (match is None or entry[0] < match[0])):
+                            match, match_cell = entry, neighbour
             
-            if not is_duplicate:
-                deduplicated.append(field)
+            if match is not None:
+                # Keep field with higher confidence
+                if field.confidence <= match[1].confidence:
+                    continue
+                grid[match_cell].remove(match)
+                del kept[match[0]]
+            
+            grid.setdefault(cell, []).append((order, field))
+            kept[order] = field
         
-        return deduplicated
+        return list(kept.values())
     
     def _detect_background_color(self, image: Image.Image) -> str:
         """Detect the background/dominant color of the certificate."""
         try:
-            # Resize for faster processing
-            small = image.resize((150, 150))
-            # Get all colors
-            colors = small.getcolors(maxcolors=150*150)
-            if colors:
-                # Find most common color (likely background)
-                bg_color = max(colors, key=lambda x: x[0])[1]
+            # Sample a 150x150 grid for faster processing. Nearest-neighbour
+            # keeps exact pixel colors (no blending at edges) and skips the
+            # filtered resample, which cost far more than the counting
+            small = image.resize((150, 150), Image.NEAREST)
+            # Find most common color (likely background)
+            bg_color = self._dominant_color(np.asarray(small))
+            if bg_color is not None:
                 return self._rgb_to_hex(bg_color)
         except Exception as e:
             logger.debug(f"Background color detection error: {e}")
@@ -335,6 +568,23 @@ class CertificateScanner:
         
         return min(1.0, avg_confidence + field_bonus)
     
+    @staticmethod
+    def _dominant_color(pixels: np.ndarray) -> Optional[Tuple[int, int, int]]:
+        """Return the most frequent color of an RGB pixel array, or None if it is empty.
+        
+        Pixels (any H x W x 3 array or view) are packed into 24-bit integers
+        and counted with np.unique,
+        instead of building a Python (count, color) tuple per distinct color
+        with Image.getcolors.
+        """
+        pixels = pixels.reshape(-1, 3)
+        if pixels.size == 0:
+            return None
+        keys = (pixels[:, 0].astype(np.uint32) << 16) | (pixels[:, 1].astype(np.uint32) << 8) | pixels[:, 2]
+        values, counts = np.unique(keys, return_counts=True)
+        top = int(values[counts.argmax()])
+        return (top >> 16, (top >> 8) & 0xFF, top & 0xFF)
+    
     @staticmethod
     def _rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
         """Convert RGB tuple to hex color string."""
@@ -343,21 +593,61 @@ class CertificateScanner:
         return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
 
 
+# Per-process scanner used by scan_many worker processes
+_worker_scanner = None
+
+
+def _init_scan_worker(dpi: int, ocr_lang: str, ocr_dpi: Optional[int], tesseract_cmd: str):
+    """Limit Tesseract to one thread and build the scanner once per worker."""
+    global _worker_scanner
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    _worker_scanner = CertificateScanner(dpi=dpi, ocr_lang=ocr_lang, ocr_dpi=ocr_dpi)
+
+
+def _scan_chunk(certificate_paths: List[str]) -> List[TemplateAnalysis]:
+    """Scan one chunk of a scan_many call."""
+    return _worker_scanner.scan_certificates(certificate_paths)
+
+
 class SmartCertificateAligner:
     """
     Aligns and places values on certificates with precise positioning and sizing.
     Uses scanned template information for accurate placement.
     """
     
-    def __init__(self, template_analysis: TemplateAnalysis):
+    # Lossy formats chosen by output extension; JPEG/WebP encode much faster
+    # than PNG and suit photographic backgrounds. Anything else is saved as PNG.
+    LOSSY_FORMATS = {
+        '.jpg': ('JPEG', {'quality': 90, 'optimize': False}),
+        '.jpeg': ('JPEG', {'quality': 90, 'optimize': False}),
+        '.webp': ('WEBP', {'quality': 90, 'method': 0}),
+    }
+    
+    def __init__(self, template_analysis: TemplateAnalysis, png_compress_level: int = 1):
         """
         Initialize the aligner with template analysis.
         
         Args:
             template_analysis: TemplateAnalysis from CertificateScanner
+            png_compress_level: zlib level for PNG output, 0-9 (default: 1,
+                several times faster to encode than Pillow's default of 6)
         """
         self.analysis = template_analysis
+        self.png_compress_level = png_compress_level
         self.field_mapping = {}
+        
+        # Matched user-field key per detected text, per set of user-field keys.
+        # Recipients in a batch share keys, so matching runs once per batch.
+        self._key_matches = {}
+        
+        # Value per detected field (None when unmapped), set by map_fields
+        self._values: List[Optional[str]] = []
+        
+        # Set by prepare(): decoded template and per-field draw parameters
+        self._template_path = None
+        self._template = None
+        self._draw_plan = []
     
     def map_fields(self, fields_data: Dict[str, str]) -> Dict[str, DetectedField]:
         """
@@ -371,108 +661,170 @@ class SmartCertificateAligner:
         """
         mapping = {}
         
-        for field in self.analysis.detected_fields:
-            # Try to match field to user data
-            best_match = self._find_best_match(field.text, fields_data)
+        keys = tuple(fields_data)
+        key_matches = self._key_matches.get(keys)
+        if key_matches is None:
+            # Try to match each field to a user data key
+            key_matches = {}
+            for field in self.analysis.detected_fields:
+                key = self._find_best_key(field.text, keys)
+                if key is not None:
+                    key_matches[field.text] = key
+            self._key_matches[keys] = key_matches
+        
+        for field_text, key in key_matches.items():
+            best_match = fields_data[key]
             if best_match:
-                mapping[field.text] = best_match
+                mapping[field_text] = best_match
         
         self.field_mapping = mapping
+        self._values = [mapping.get(field.text) for field in self.analysis.detected_fields]
         return mapping
     
     def _find_best_match(self, detected_text: str, user_fields: Dict[str, str]) -> Optional[str]:
         """Find the best matching user field for a detected text."""
+        key = self._find_best_key(detected_text, user_fields)
+        return user_fields[key] if key is not None else None
+    
+    @staticmethod
+    def _find_best_key(detected_text: str, keys) -> Optional[str]:
+        """Find the first user field key matching a detected text."""
         detected_lower = detected_text.lower()
         
-        for key, value in user_fields.items():
+        for key in keys:
             key_lower = key.lower()
             
             # Exact match
             if key_lower == detected_lower:
-                return value
+                return key
             
             # Partial match
             if key_lower in detected_lower or detected_lower in key_lower:
-                return value
+                return key
         
         return None
     
-    def generate_aligned_certificate(
-        self,
-        template_image_path: str,
-        fields_data: Dict[str, str],
-        output_path: str
-    ) -> str:
+    def prepare(self, template_image_path: str):
         """
-        Generate certificate with precisely aligned values on template.
+        Load the template and resolve every field's draw parameters once.
+        
+        Pixel position, font, RGB color and anchor depend only on the
+        template, so they are computed here instead of for every recipient.
+        generate_aligned_certificate calls this automatically when the
+        template path changes.
         
         Args:
             template_image_path: Path to certificate template image
+        """
+        self._template = Image.open(template_image_path).convert('RGB')
+        self._template_path = template_image_path
+        # Aligned index-for-index with detected_fields and map_fields' _values
+        self._draw_plan = [
+            self._field_draw_params(field, self._template.size)
+            for field in self.analysis.detected_fields
+        ]
+    
+    def render(self, fields_data: Dict[str, str], output_path: str) -> str:
+        """
+        Draw field values on a copy of the prepared template and save it.
+        
+        The output format follows output_path's extension: .jpg/.jpeg and
+        .webp are saved lossy (quality 90, fastest encoder settings), anything
+        else as PNG.
+        
+        Args:
             fields_data: Field values to place
             output_path: Path to save generated certificate
         
         Returns:
             Path to generated certificate
         """
-        # Load template image
-        image = Image.open(template_image_path).convert('RGB')
+        if self._template is None:
+            raise RuntimeError("SmartCertificateAligner.prepare() must be called before render()")
+        
+        image = self._template.copy()
         draw = ImageDraw.Draw(image)
         
         # Map fields
-        mapping = self.map_fields(fields_data)
+        self.map_fields(fields_data)
         
         # Draw replacements
-        for field in self.analysis.detected_fields:
-            if field.text in mapping:
-                replacement_text = mapping[field.text]
-                self._draw_field(
-                    draw,
-                    replacement_text,
-                    field,
-                    image.size
-                )
+        for (x, y, font, color, anchor), value in zip(self._draw_plan, self._values):
+            if value is not None:
+                draw.text((x, y), value, font=font, fill=color, anchor=anchor)
         
         # Save
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        image.save(output_path, 'PNG')
+        ext = os.path.splitext(output_path)[1].lower()
+        if ext in self.LOSSY_FORMATS:
+            fmt, save_kwargs = self.LOSSY_FORMATS[ext]
+            image.save(output_path, fmt, **save_kwargs)
+        else:
+            image.save(output_path, 'PNG', compress_level=self.png_compress_level, optimize=False)
         logger.info(f"Generated aligned certificate: {output_path}")
         
         return output_path
     
-    def _draw_field(
+    def generate_aligned_certificate(
+        self,
+        template_image_path: str,
+        fields_data: Dict[str, str],
+        output_path: str
+    ) -> str:
+        """
+        Generate certificate with precisely aligned values on template.
+        
+        Args:
+            template_image_path: Path to certificate template image
+            fields_data: Field values to place
+            output_path: Path to save generated certificate
+        
+        Returns:
+            Path to generated certificate
+        """
+        # Template is decoded and the draw plan built once per template path
+        if template_image_path != self._template_path:
+            self.prepare(template_image_path)
+        
+        return self.render(fields_data, output_path)
+    
+    def _field_draw_params(
         self,
-        draw: ImageDraw.ImageDraw,
-        text: str,
         field: DetectedField,
         image_size: Tuple[int, int]
-    ):
-        """Draw text field with precise alignment and sizing."""
+    ) -> Tuple[float, float, ImageFont.ImageFont, Tuple[int, int, int], str]:
+        """Resolve a field's pixel position, font, color and anchor."""
         width, height = image_size
         
         # Calculate pixel coordinates
         x = field.x * width
         y = field.y * height
         
-        # Load font with detected size
-        try:
-            font = ImageFont.truetype("arial.ttf", field.font_size)
-        except:
-            font = ImageFont.load_default()
+        # Load font with detected size (memoized per size across recipients)
+        font = get_font("arial.ttf", field.font_size)
         
         # Get text color
         try:
-            color = int(field.color.lstrip('#'), 16)
-            color = tuple(int(field.color[i:i+2], 16) for i in (1, 3, 5))
-        except:
+            color = self._hex_to_rgb(field.color)
+        except (ValueError, TypeError):
             color = (0, 0, 0)
         
         # Apply alignment
         if field.alignment == "center":
-            draw.text((x, y), text, font=font, fill=color, anchor="mm")
+            anchor = "mm"
         elif field.alignment == "right":
-            draw.text((x, y), text, font=font, fill=color, anchor="rm")
+            anchor = "rm"
         else:  # left
-            draw.text((x, y), text, font=font, fill=color, anchor="lm")
+            anchor = "lm"
+        
+        return x, y, font, color, anchor
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
+        """Convert a '#RRGGBB' string to an RGB tuple (memoized; fields share few colors)."""
+        hex_color = hex_color.lstrip('#')
+        return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16))
 
 
 class TemplateCreator:
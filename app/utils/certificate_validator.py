@@ -5,8 +5,15 @@ ensuring that text fields are positioned correctly according to template specifi
 """
 import os
 import json
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import cv2
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import logging
+from app.utils.goonj_renderer import POSITIONS_SUFFIX
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +25,31 @@ except ImportError:
     PYTESSERACT_AVAILABLE = False
     logger.debug("pytesseract not available - OCR-based validation disabled")
 
+# Sparse-text page segmentation on a binarised image: fields are isolated
+# lines scattered over the certificate, and the image is never inverted
+OCR_CONFIG = '--psm 11 -c tessedit_do_invert=0'
 
-def validate(generated_path, template_ref_path=None, expected_positions=None, tolerance_px=3):
+# OCR boxes are matched to a field within this fraction of the image height
+# of its expected y; only the band covering these windows is OCRed
+OCR_SEARCH_RANGE = 0.1
+
+# When validate() writes the comparison overlay image
+OVERLAY_MODES = ('always', 'on_fail', 'never')
+
+# Overlay encoders by format. WebP at method 0 encodes faster than PNG and
+# is several times smaller; PNG stays available for lossless inspection.
+OVERLAY_FORMATS = {
+    'webp': ('WEBP', {'method': 0, 'quality': 80}),
+    'png': ('PNG', {'compress_level': 1, 'optimize': False}),
+}
+
+# Parsed offsets JSON per path, keyed by the file's (mtime_ns, size) so
+# recalibrated offsets are picked up on the next validation
+_positions_cache = {}
+
+
+def validate(generated_path, template_ref_path=None, expected_positions=None, tolerance_px=3,
+             generate_overlay='on_fail', overlay_format='webp'):
     """Validate certificate text alignment against expected positions.
     
     Args:
@@ -28,6 +58,10 @@ def validate(generated_path, template_ref_path=None, expected_positions=None, to
         expected_positions: Dict of expected field positions (optional)
                            Format: {'field_name': {'x': normalized, 'y': normalized}}
         tolerance_px: Maximum allowed pixel offset (default: 3)
+        generate_overlay: When to write the comparison overlay: 'always',
+                          'on_fail' (default, only if a field is out of
+                          tolerance) or 'never'
+        overlay_format: Overlay image format, 'webp' (default) or 'png'
     
     Returns:
         Dictionary with validation results:
@@ -43,17 +77,164 @@ def validate(generated_path, template_ref_path=None, expected_positions=None, to
                     'ok': bool
                 }
             },
-            'overlay_path': str (path to comparison overlay image)
+            'overlay_path': str (path to comparison overlay image, or None
+                            if no overlay was written)
         }
     """
+    _check_overlay_mode(generate_overlay, overlay_format)
     if not os.path.exists(generated_path):
         raise FileNotFoundError(f"Generated certificate not found: {generated_path}")
     
     # Load generated certificate
     gen_img = Image.open(generated_path).convert('RGB')
-    width, height = gen_img.size
     
     # Get expected positions
+    expected_positions = _resolve_expected_positions(template_ref_path, expected_positions)
+    
+    return _validate_image(
+        gen_img, generated_path, expected_positions, tolerance_px, generate_overlay, overlay_format,
+        detected_positions=_load_drawn_positions(generated_path)
+    )
+
+
+def validate_batch(generated_paths, template_ref_path=None, expected_positions=None, tolerance_px=3,
+                   generate_overlay='on_fail', overlay_format='webp'):
+    """Validate several certificates, running Tesseract once for all of them.
+    
+    Each image_to_data call starts a Tesseract process and reloads its
+    language data; for a bulk job this start-up dominates. Here Tesseract
+    is given a list file naming every certificate, and its TSV output is
+    split back per page. Falls back to per-certificate OCR if the batch
+    run fails.
+    
+    Args:
+        generated_paths: Paths to generated certificate images
+        template_ref_path: Path to reference template image (optional)
+        expected_positions: Dict of expected field positions (optional)
+        tolerance_px: Maximum allowed pixel offset (default: 3)
+        generate_overlay: When to write overlays (see validate())
+        overlay_format: Overlay image format (see validate())
+    
+    Returns:
+        List of validation results as returned by validate(), in the same
+        order as generated_paths
+    """
+    _check_overlay_mode(generate_overlay, overlay_format)
+    generated_paths = list(generated_paths)
+    for generated_path in generated_paths:
+        if not os.path.exists(generated_path):
+            raise FileNotFoundError(f"Generated certificate not found: {generated_path}")
+    
+    expected_positions = _resolve_expected_positions(template_ref_path, expected_positions)
+    
+    images = [Image.open(path).convert('RGB') for path in generated_paths]
+    
+    drawn = [_load_drawn_positions(path) for path in generated_paths]
+    
+    # Only certificates without recorded draw positions need OCR
+    ocr_indices = [i for i, positions in enumerate(drawn) if positions is None]
+    ocr_pages = [None] * len(images)
+    if PYTESSERACT_AVAILABLE and ocr_indices:
+        try:
+            pages = _ocr_batch([images[i] for i in ocr_indices], expected_positions)
+            for i, page in zip(ocr_indices, pages):
+                ocr_pages[i] = page
+        except (OSError, subprocess.SubprocessError, pytesseract.TesseractNotFoundError) as e:
+            logger.warning(f"Batch OCR failed ({e}), running OCR per certificate")
+    
+    results = []
+    for generated_path, gen_img, ocr_data, positions in zip(generated_paths, images, ocr_pages, drawn):
+        results.append(
+            _validate_image(gen_img, generated_path, expected_positions, tolerance_px,
+                            generate_overlay, overlay_format, ocr_data,
+                            detected_positions=positions)
+        )
+    return results
+
+
+def validate_many(generated_paths, template_ref_path=None, expected_positions=None, tolerance_px=3,
+                  generate_overlay='on_fail', overlay_format='webp', workers=None, chunk_size=4):
+    """Validate many certificates across worker processes.
+    
+    OCR is the expensive part of validation and runs inside Tesseract, so a
+    single caller only keeps one core busy. Here the certificates are split
+    into chunks that worker processes validate with validate_batch, each
+    running Tesseract single-threaded (OMP_THREAD_LIMIT=1); several
+    single-threaded Tesseract processes outperform one multi-threaded one.
+    
+    Args:
+        generated_paths: Paths to generated certificate images
+        template_ref_path: Path to reference template image (optional)
+        expected_positions: Dict of expected field positions (optional)
+        tolerance_px: Maximum allowed pixel offset (default: 3)
+        generate_overlay: When to write overlays (see validate())
+        overlay_format: Overlay image format (see validate())
+        workers: Number of worker processes (default: os.cpu_count())
+        chunk_size: Certificates per Tesseract batch in a worker
+    
+    Returns:
+        List of validation results, in the same order as generated_paths
+    """
+    generated_paths = list(generated_paths)
+    workers = min(workers or os.cpu_count() or 1, len(generated_paths))
+    if workers <= 1:
+        return validate_batch(generated_paths, template_ref_path, expected_positions, tolerance_px,
+                              generate_overlay, overlay_format)
+    
+    # Resolve once here rather than re-reading the offsets JSON in every worker
+    expected_positions = _resolve_expected_positions(template_ref_path, expected_positions)
+    
+    chunks = [
+        generated_paths[i:i + chunk_size]
+        for i in range(0, len(generated_paths), chunk_size)
+    ]
+    tesseract_cmd = pytesseract.pytesseract.tesseract_cmd if PYTESSERACT_AVAILABLE else None
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_validate_worker,
+        initargs=(expected_positions, tolerance_px, generate_overlay, overlay_format, tesseract_cmd)
+    ) as executor:
+        for chunk_results in executor.map(_validate_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+# Per-process validate_many settings, set by _init_validate_worker
+_worker_settings = None
+
+
+def _init_validate_worker(expected_positions, tolerance_px, generate_overlay, overlay_format,
+                          tesseract_cmd):
+    """Limit Tesseract to one thread and store the job's settings once per worker."""
+    global _worker_settings
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    _worker_settings = (expected_positions, tolerance_px, generate_overlay, overlay_format)
+
+
+def _validate_chunk(generated_paths):
+    """Validate one chunk of a validate_many call."""
+    expected_positions, tolerance_px, generate_overlay, overlay_format = _worker_settings
+    return validate_batch(generated_paths, expected_positions=expected_positions, tolerance_px=tolerance_px,
+                          generate_overlay=generate_overlay, overlay_format=overlay_format)
+
+
+def _check_overlay_mode(generate_overlay, overlay_format):
+    """Reject unknown generate_overlay/overlay_format values up front."""
+    if generate_overlay not in OVERLAY_MODES:
+        raise ValueError(
+            f"generate_overlay must be one of {', '.join(OVERLAY_MODES)}, got {generate_overlay!r}"
+        )
+    if overlay_format not in OVERLAY_FORMATS:
+        raise ValueError(
+            f"overlay_format must be one of {', '.join(OVERLAY_FORMATS)}, got {overlay_format!r}"
+        )
+
+
+def _resolve_expected_positions(template_ref_path=None, expected_positions=None):
+    """Return expected positions, loading them from JSON or using defaults."""
     if expected_positions is None:
         expected_positions = _load_expected_positions(template_ref_path)
     
@@ -65,47 +246,84 @@ def validate(generated_path, template_ref_path=None, expected_positions=None, to
             'event': {'x': 0.5, 'y': 0.42},
             'organiser': {'x': 0.5, 'y': 0.51}
         }
+    return expected_positions
+
+
+def _validate_image(gen_img, generated_path, expected_positions, tolerance_px, generate_overlay,
+                    overlay_format, ocr_data=None, detected_positions=None):
+    """Compare detected field positions in a loaded certificate with expected ones.
+    
+    Args:
+        gen_img: RGB PIL Image of the generated certificate
+        generated_path: Path the certificate was loaded from (names the overlay)
+        expected_positions: Dict of expected field positions
+        tolerance_px: Maximum allowed pixel offset
+        generate_overlay: When to write the overlay (see validate())
+        overlay_format: Overlay image format (see validate())
+        ocr_data: Precomputed image_to_data dict for gen_img (optional)
+        detected_positions: Field positions already known, e.g. recorded by
+            the renderer; skips OCR when given (optional)
+    
+    Returns:
+        Validation result dictionary (see validate())
+    """
+    width, height = gen_img.size
     
     # Detect actual positions in generated certificate
-    detected_positions = _detect_text_positions(gen_img, expected_positions)
+    if detected_positions is None:
+        detected_positions = _detect_text_positions(gen_img, expected_positions, ocr_data)
     
-    # Compare positions and compute offsets
-    details = {}
-    all_ok = True
+    # Compare positions and compute offsets for all fields at once
+    field_names = list(expected_positions)
+    expected = np.array(
+        [(expected_positions[name]['x'], expected_positions[name]['y']) for name in field_names],
+        dtype=np.float64
+    ).reshape(-1, 2)
+    # Detected position, or expected if detection failed
+    detected = np.array(
+        [(detected_positions.get(name, expected_positions[name])['x'],
+          detected_positions.get(name, expected_positions[name])['y']) for name in field_names],
+        dtype=np.float64
+    ).reshape(-1, 2)
     
-    for field_name, expected in expected_positions.items():
-        # Convert normalized to pixel coordinates
-        ref_px = (int(expected['x'] * width), int(expected['y'] * height))
-        
-        # Get detected position (or use expected if detection failed)
-        detected = detected_positions.get(field_name, expected)
-        gen_px = (int(detected['x'] * width), int(detected['y'] * height))
-        
-        # Calculate offsets
-        dx = gen_px[0] - ref_px[0]
-        dy = gen_px[1] - ref_px[1]
-        distance = (dx**2 + dy**2)**0.5
-        
-        # Check if within tolerance
-        ok = abs(dx) <= tolerance_px and abs(dy) <= tolerance_px
-        all_ok = all_ok and ok
-        
-        details[field_name] = {
-            'gen_px': gen_px,
-            'ref_px': ref_px,
-            'dx': dx,
-            'dy': dy,
-            'distance': round(distance, 2),
-            'ok': ok
+    # Normalized to pixel coordinates (truncating like int())
+    scale = np.array([width, height], dtype=np.float64)
+    ref_px = (expected * scale).astype(np.int64)
+    gen_px = (detected * scale).astype(np.int64)
+    
+    delta = gen_px - ref_px
+    distance = np.sqrt((delta ** 2).sum(axis=1))
+    
+    # Check if within tolerance
+    ok = (np.abs(delta) <= tolerance_px).all(axis=1)
+    all_ok = bool(ok.all())
+    
+    details = {
+        name: {
+            'gen_px': tuple(gen),
+            'ref_px': tuple(ref),
+            'dx': d[0],
+            'dy': d[1],
+            'distance': round(dist, 2),
+            'ok': field_ok
         }
+        for name, gen, ref, d, dist, field_ok in zip(
+            field_names, gen_px.tolist(), ref_px.tolist(), delta.tolist(),
+            distance.tolist(), ok.tolist()
+        )
+    }
     
-    # Generate overlay visualization
-    overlay_path = _generate_overlay(
-        gen_img, 
-        details, 
-        generated_path,
-        tolerance_px
-    )
+    # Generate overlay visualization; it only matters when something is
+    # off, so passing certificates skip the draw and encode by default
+    overlay_path = None
+    if generate_overlay == 'always' or (generate_overlay == 'on_fail' and not all_ok):
+        overlay_path = _generate_overlay(
+            gen_img, 
+            details, 
+            generated_path,
+            tolerance_px,
+            overlay_format
+        )
     
     return {
         'pass': all_ok,
@@ -115,6 +333,33 @@ def validate(generated_path, template_ref_path=None, expected_positions=None, to
     }
 
 
+def _load_drawn_positions(generated_path):
+    """Load the field positions the renderer recorded for a certificate.
+    
+    GOONJRenderer(write_positions=True) writes <certificate>.pos.json with
+    the normalized centre of each text box it drew; reading it replaces OCR.
+    Not cached: certificates can be regenerated under the same path.
+    
+    Args:
+        generated_path: Path to the generated certificate image
+    
+    Returns:
+        Dictionary of field positions or None if there is no usable file
+    """
+    positions_path = generated_path + POSITIONS_SUFFIX
+    try:
+        with open(positions_path, 'r') as f:
+            positions = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load drawn positions from {positions_path}: {e}")
+        return None
+    
+    logger.debug(f"Using drawn positions from {positions_path} instead of OCR")
+    return positions
+
+
 def _load_expected_positions(template_ref_path=None):
     """Load expected field positions from JSON configuration.
     
@@ -136,26 +381,137 @@ def _load_expected_positions(template_ref_path=None):
     if not offsets_path or not os.path.exists(offsets_path):
         offsets_path = 'templates/goonj_template_offsets.json'
     
-    if os.path.exists(offsets_path):
+    try:
+        stat = os.stat(offsets_path)
+    except OSError:
+        return None
+    
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _positions_cache.get(offsets_path)
+    if cached is None or cached[0] != signature:
         try:
             with open(offsets_path, 'r') as f:
                 data = json.load(f)
-                if 'fields' in data:
-                    positions = {}
-                    for field_name, field_data in data['fields'].items():
-                        positions[field_name] = {
-                            'x': field_data['x'],
-                            'y': field_data['y']
-                        }
-                    logger.info(f"Loaded expected positions from {offsets_path}")
-                    return positions
+            if 'fields' not in data:
+                return None
+            positions = {}
+            for field_name, field_data in data['fields'].items():
+                positions[field_name] = {
+                    'x': field_data['x'],
+                    'y': field_data['y']
+                }
         except Exception as e:
             logger.warning(f"Could not load positions from {offsets_path}: {e}")
+            return None
+        logger.info(f"Loaded expected positions from {offsets_path}")
+        cached = _positions_cache[offsets_path] = (signature, positions)
+    
+    # Copy so callers can't modify the cached positions
+    return {field_name: dict(position) for field_name, position in cached[1].items()}
+
+
+def _preprocess_for_ocr(image):
+    """Binarise a certificate for OCR with a Gaussian adaptive threshold.
+    
+    Rendered text on a coloured or textured background otherwise yields
+    many low-confidence boxes; a clean black-on-white page gives Tesseract
+    fewer, higher-confidence candidates.
+    
+    Args:
+        image: RGB PIL Image of the certificate
     
-    return None
+    Returns:
+        Binary ('L' mode) PIL Image of the same size
+    """
+    gray = np.asarray(image.convert('L'))
+    binary = cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10
+    )
+    return Image.fromarray(binary)
+
+
+def _ocr_band(expected_positions, height):
+    """Return the (top, bottom) pixel rows covering every field's search window.
+    
+    The band is padded by half a window so words straddling a window edge
+    are not cut, and falls back to the whole image if positions are off-page.
+    """
+    search_range = int(height * OCR_SEARCH_RANGE)
+    pad = search_range + search_range // 2
+    ys = [int(position['y'] * height) for position in expected_positions.values()]
+    top = max(0, min(ys) - pad)
+    bottom = min(height, max(ys) + pad)
+    if bottom <= top:
+        return 0, height
+    return top, bottom
 
 
-def _detect_text_positions(image, expected_positions):
+def _ocr_input(image, expected_positions):
+    """Crop the fields' band from a certificate and binarise it for OCR.
+    
+    Returns:
+        Tuple of (binary band image, band top row in the full image)
+    """
+    width, height = image.size
+    top, bottom = _ocr_band(expected_positions, height)
+    return _preprocess_for_ocr(image.crop((0, top, width, bottom))), top
+
+
+def _shift_ocr_rows(ocr_data, dy):
+    """Move image_to_data box tops from band to full-image coordinates."""
+    if dy:
+        ocr_data['top'] = [top + dy for top in ocr_data['top']]
+    return ocr_data
+
+
+def _ocr_batch(images, expected_positions):
+    """Run Tesseract once over several images and split its TSV output per page.
+    
+    Only the band around the expected field positions is OCRed (see
+    _ocr_band); box coordinates are returned relative to the full image.
+    
+    Args:
+        images: RGB PIL Images of the certificates
+        expected_positions: Dict of expected field positions
+    
+    Returns:
+        One image_to_data-style dict per image
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        page_paths = []
+        band_tops = []
+        for i, image in enumerate(images):
+            page_path = os.path.join(tmpdir, f"page_{i}.png")
+            band, band_top = _ocr_input(image, expected_positions)
+            band.save(page_path, 'PNG', compress_level=1)
+            page_paths.append(page_path)
+            band_tops.append(band_top)
+        
+        list_path = os.path.join(tmpdir, 'pages.txt')
+        with open(list_path, 'w') as f:
+            f.write('\n'.join(page_paths) + '\n')
+        
+        result = subprocess.run(
+            [pytesseract.pytesseract.tesseract_cmd, list_path, 'stdout',
+             '-c', 'tessedit_create_tsv=1', *OCR_CONFIG.split(), 'tsv'],
+            capture_output=True, check=True
+        )
+    
+    data = pytesseract.pytesseract.file_to_dict(
+        result.stdout.decode('utf-8', errors='replace'), '\t', -1
+    )
+    
+    # Rows carry a 1-based page_num, one page per list entry
+    pages = [{key: [] for key in data} for _ in images]
+    for row, page_num in enumerate(data.get('page_num', [])):
+        if isinstance(page_num, int) and 1 <= page_num <= len(pages):
+            page = pages[page_num - 1]
+            for key, values in data.items():
+                page[key].append(values[row])
+    return [_shift_ocr_rows(page, band_top) for page, band_top in zip(pages, band_tops)]
+
+
+def _detect_text_positions(image, expected_positions, ocr_data=None):
     """Detect actual text positions in the generated certificate.
     
     Uses OCR if available, otherwise estimates based on expected positions.
@@ -163,6 +519,7 @@ def _detect_text_positions(image, expected_positions):
     Args:
         image: PIL Image object of the certificate
         expected_positions: Dict of expected positions for guidance
+        ocr_data: Precomputed image_to_data dict for image (optional)
     
     Returns:
         Dictionary of detected positions (normalized coordinates)
@@ -177,7 +534,23 @@ def _detect_text_positions(image, expected_positions):
         width, height = image.size
         
         # Get OCR data with bounding boxes
-        ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+        if ocr_data is None:
+            # OCR only the band around the fields; Tesseract's cost grows
+            # with image area
+            band, band_top = _ocr_input(image, expected_positions)
+            ocr_data = _shift_ocr_rows(
+                pytesseract.image_to_data(band, config=OCR_CONFIG, output_type=pytesseract.Output.DICT),
+                band_top
+            )
+        
+        # Box centres and confidences as arrays, built once for all fields
+        conf = np.asarray(ocr_data['conf'], dtype=np.float64)
+        top = np.asarray(ocr_data['top'], dtype=np.int64)
+        left = np.asarray(ocr_data['left'], dtype=np.int64)
+        center_y = top + np.asarray(ocr_data['height'], dtype=np.int64) // 2
+        center_x = left + np.asarray(ocr_data['width'], dtype=np.int64) // 2
+        valid = conf > 0  # Valid detection
+        search_range = int(height * OCR_SEARCH_RANGE)  # Search within 10% of height
         
         detected = {}
         
@@ -185,26 +558,16 @@ def _detect_text_positions(image, expected_positions):
         for field_name, expected in expected_positions.items():
             # Define search region around expected position
             search_y = int(expected['y'] * height)
-            search_range = int(height * 0.1)  # Search within 10% of height
             
-            # Find text boxes in this region
-            best_match = None
-            best_confidence = 0
+            # Most confident text box in this region (first one on ties)
+            candidates = np.flatnonzero(valid & (np.abs(center_y - search_y) < search_range))
             
-            for i, conf in enumerate(ocr_data['conf']):
-                if conf > 0:  # Valid detection
-                    box_y = ocr_data['top'][i] + ocr_data['height'][i] // 2
-                    if abs(box_y - search_y) < search_range:
-                        if conf > best_confidence:
-                            best_confidence = conf
-                            box_x = ocr_data['left'][i] + ocr_data['width'][i] // 2
-                            best_match = {
-                                'x': box_x / width,
-                                'y': box_y / height
-                            }
-            
-            if best_match:
-                detected[field_name] = best_match
+            if candidates.size:
+                best = candidates[conf[candidates].argmax()]
+                detected[field_name] = {
+                    'x': int(center_x[best]) / width,
+                    'y': int(center_y[best]) / height
+                }
             else:
                 # Use expected position as fallback
                 detected[field_name] = expected
@@ -216,27 +579,29 @@ def _detect_text_positions(image, expected_positions):
         return expected_positions
 
 
-def _generate_overlay(image, details, original_path, tolerance_px):
+def _generate_overlay(image, details, original_path, tolerance_px, overlay_format='webp'):
     """Generate visual overlay showing alignment validation.
     
+    Markers are drawn directly onto ``image``; validate() decodes a fresh
+    copy of the certificate and does not use it afterwards.
+    
     Args:
-        image: PIL Image object
+        image: PIL Image object (modified in place)
         details: Validation details dictionary
         original_path: Path to original generated certificate
         tolerance_px: Tolerance in pixels
+        overlay_format: Key of OVERLAY_FORMATS to save as (default: 'webp')
     
     Returns:
         Path to saved overlay image
     """
-    # Create overlay image
-    overlay = image.copy()
+    # Draw on the decoded certificate itself; copying a full-resolution
+    # frame only to throw the original away is pure memory traffic
+    overlay = image
     draw = ImageDraw.Draw(overlay)
     
-    # Load a font for labels
-    try:
-        font = ImageFont.truetype("arial.ttf", 16)
-    except (OSError, IOError):
-        font = ImageFont.load_default()
+    # Font for labels
+    font = _overlay_font()
     
     # Draw markers and comparison lines
     for field_name, data in details.items():
@@ -268,14 +633,25 @@ def _generate_overlay(image, details, original_path, tolerance_px):
     draw.text((10, legend_y + 40), f"Tolerance: {tolerance_px}px", fill=(255, 255, 255), font=font)
     
     # Save overlay
-    base_path, ext = os.path.splitext(original_path)
-    overlay_path = f"{base_path}_validation_overlay{ext if ext else '.png'}"
-    overlay.save(overlay_path)
+    base_path, _ = os.path.splitext(original_path)
+    overlay_path = f"{base_path}_validation_overlay.{overlay_format}"
+    # Transient debug output: favour encode speed
+    fmt, save_kwargs = OVERLAY_FORMATS[overlay_format]
+    overlay.save(overlay_path, fmt, **save_kwargs)
     logger.info(f"Validation overlay saved to {overlay_path}")
     
     return overlay_path
 
 
+@lru_cache(maxsize=1)
+def _overlay_font():
+    """Load the overlay label font once per process."""
+    try:
+        return ImageFont.truetype("arial.ttf", 16)
+    except (OSError, IOError):
+        return ImageFont.load_default()
+
+
 def _draw_crosshair(draw, position, color, size=10):
     """Draw a crosshair marker at the given position.
     
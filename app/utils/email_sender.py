@@ -1,15 +1,54 @@
 """Email utility for sending certificates."""
 from flask_mail import Mail, Message
 from flask import current_app
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
 import os
 import logging
+import random
+import smtplib
 import time
 
+__all__ = [
+    'mail',
+    'retry_delay',
+    'send_with_retries',
+    'send_certificate_email',
+    'send_certificate_emails_bulk',
+    'send_bulk_notification',
+]
+
 mail = Mail()
 logger = logging.getLogger(__name__)
 
+# SMTP errors that will fail the same way on every attempt
+PERMANENT_SMTP_ERRORS = (
+    smtplib.SMTPAuthenticationError,
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+)
+
+# Upper bound on a single backoff sleep, in seconds
+MAX_BACKOFF_SECONDS = 60
+
+
+def retry_delay(attempt):
+    """Return a jittered exponential backoff delay for a failed attempt.
+
+    The delay is drawn from [base/2, base] with base = 2**attempt capped at
+    MAX_BACKOFF_SECONDS, so concurrent senders hitting the same transient
+    SMTP failure don't retry in lockstep.
+
+    Args:
+        attempt: 1-based number of the attempt that just failed
+    """
+    base = min(2 ** min(attempt, 6), MAX_BACKOFF_SECONDS)
+    return random.uniform(base / 2, base)
+
 
-def send_certificate_email(recipient_email, recipient_name, event_name, certificate_path, retries=None):
+def send_certificate_email(recipient_email, recipient_name, event_name, certificate_path, retries=None,
+                           session=None):
     """Send certificate via email with retries.
 
     Returns True if sent, False otherwise. Retries a configured number of times on transient errors.
@@ -20,6 +59,7 @@ def send_certificate_email(recipient_email, recipient_name, event_name, certific
         event_name: Name of the event
         certificate_path: Path to certificate file
         retries: Number of retry attempts (defaults to EMAIL_MAX_RETRIES from config, or 3)
+        session: Shared SMTP session to send over (optional, see send_with_retries)
     """
     # Get retry count from config if not specified
     if retries is None:
@@ -40,6 +80,49 @@ Best regards,
 AMA Certificate Generator Team
     """
 
+    # Read the certificate once; retries reuse the same bytes
+    cert_bytes = None
+    if os.path.exists(certificate_path):
+        with open(certificate_path, 'rb') as cert_file:
+            cert_bytes = cert_file.read()
+
+    sent, _ = send_with_retries(
+        recipient_email, subject, body,
+        attachment_name=os.path.basename(certificate_path),
+        attachment_data=cert_bytes,
+        retries=retries,
+        session=session
+    )
+    return sent
+
+
+def send_with_retries(recipient_email, subject, body, attachment_name=None, attachment_data=None,
+                      retries=None, session=None):
+    """Send one email, retrying transient failures with jittered backoff.
+
+    This is the single retry loop behind every certificate email.
+    Permanent SMTP errors (see PERMANENT_SMTP_ERRORS) are not retried.
+
+    Args:
+        recipient_email: Email address of recipient
+        subject: Message subject
+        body: Plain-text message body
+        attachment_name: Filename of the PNG attachment (optional)
+        attachment_data: Bytes of the PNG attachment; nothing is attached if None
+        retries: Number of attempts (defaults to EMAIL_MAX_RETRIES from config, or 3)
+        session: Shared SMTP session (used by send_certificate_emails_bulk) to
+                 send over instead of a new SMTP session per message; it is
+                 reopened after a transient failure
+
+    Returns:
+        Tuple (sent, attempts): whether the email was sent and how many
+        attempts were made
+    """
+    if retries is None:
+        retries = current_app.config.get('EMAIL_MAX_RETRIES', 3)
+
+    sender = current_app.config.get('MAIL_DEFAULT_SENDER')
+
     for attempt in range(1, retries + 1):
         try:
             msg = Message(
@@ -47,33 +130,139 @@ AMA Certificate Generator Team
                 recipients=[recipient_email],
                 body=body
             )
-            
+
             # Set sender if configured
-            if current_app.config.get('MAIL_DEFAULT_SENDER'):
-                msg.sender = current_app.config['MAIL_DEFAULT_SENDER']
+            if sender:
+                msg.sender = sender
 
             # Attach certificate
-            if os.path.exists(certificate_path):
-                with open(certificate_path, 'rb') as cert_file:
-                    msg.attach(
-                        filename=os.path.basename(certificate_path),
-                        content_type='image/png',
-                        data=cert_file.read()
-                    )
+            if attachment_data is not None:
+                msg.attach(
+                    filename=attachment_name,
+                    content_type='image/png',
+                    data=attachment_data
+                )
 
-            mail.send(msg)
-            logger.info(f"Certificate email sent successfully to {recipient_email}")
-            return True
+            if session is not None:
+                session.send(msg)
+            else:
+                mail.send(msg)
+            logger.info(f"Certificate email sent successfully to {recipient_email} (attempt {attempt}/{retries})")
+            return True, attempt
+
+        except PERMANENT_SMTP_ERRORS as e:
+            # Retrying can't fix a rejected login, sender or recipient
+            logger.error(f"Permanent error sending email to {recipient_email}, not retrying: {str(e)}")
+            return False, attempt
 
         except Exception as e:
             # Log error and retry for transient issues
             logger.warning(f"Attempt {attempt}/{retries} - Error sending email to {recipient_email}: {str(e)}")
             if attempt < retries:
-                # exponential backoff
-                time.sleep(2 ** attempt)
+                # Jittered exponential backoff, capped at MAX_BACKOFF_SECONDS
+                wait_time = retry_delay(attempt)
+                logger.info(f"Waiting {wait_time:.1f}s before retry...")
+                time.sleep(wait_time)
+                if session is not None:
+                    # The shared session may have been dropped
+                    session.open()
             else:
                 logger.error(f"Failed to send certificate email to {recipient_email} after {retries} attempts")
-                return False
+
+    return False, retries
+
+
+def send_certificate_emails_bulk(items, max_workers=None):
+    """Send many certificate emails concurrently.
+
+    Each send is dominated by SMTP round-trips, so sends are overlapped on a
+    thread pool. Items are split into one contiguous share per worker, and
+    each worker sends its share over a single SMTP session, paying the
+    connect/STARTTLS/login handshake once rather than per email. The pool
+    size therefore also caps simultaneous SMTP connections.
+
+    Args:
+        items: Iterable of dicts with send_certificate_email keyword arguments
+               (recipient_email, recipient_name, event_name, certificate_path)
+        max_workers: Concurrent sends (defaults to EMAIL_MAX_WORKERS from config, or 8)
+
+    Returns:
+        List of booleans, one per item in order, True if that email was sent
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    if max_workers is None:
+        max_workers = current_app.config.get('EMAIL_MAX_WORKERS', 8)
+
+    workers = max(1, min(max_workers, len(items)))
+    share = -(-len(items) // workers)
+    shares = [items[i:i + share] for i in range(0, len(items), share)]
+
+    # Worker threads need their own app context for config and Flask-Mail
+    app = current_app._get_current_object()
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for share_results in executor.map(partial(_send_share, app), shares):
+            results.extend(share_results)
+
+    logger.info(f"Bulk certificate emails: {sum(results)} sent, {len(results) - sum(results)} failed")
+    return results
+
+
+def _send_share(app, items):
+    """Send one worker's share of a bulk job over a single SMTP session."""
+    with app.app_context():
+        session = _SmtpSession()
+        session.open()
+        try:
+            return [bool(send_certificate_email(**item, session=session)) for item in items]
+        finally:
+            session.close()
+
+
+class _SmtpSession:
+    """One SMTP session reused across sends, opened with mail.connect().
+
+    Holds the `with mail.connect()` block open between sends, and reopening
+    it after a failure exits that block and enters a new one. If the server
+    can't be reached, sends fall back to mail.send(), a fresh session per
+    message, so they still fail and get retried rather than being dropped.
+    """
+
+    def __init__(self):
+        self._stack = None
+        self._connection = None
+
+    def open(self):
+        """(Re)open the session; returns False if the server can't be reached."""
+        self.close()
+        stack = ExitStack()
+        try:
+            self._connection = stack.enter_context(mail.connect())
+        except Exception as e:
+            logger.warning(f"Could not open SMTP session: {str(e)}")
+            return False
+        self._stack = stack
+        return True
+
+    def send(self, msg):
+        """Send msg over the open session, or on its own if none is open."""
+        if self._connection is not None:
+            self._connection.send(msg)
+        else:
+            mail.send(msg)
+
+    def close(self):
+        """Leave the session's mail.connect() block, ignoring a dropped link."""
+        stack, self._stack, self._connection = self._stack, None, None
+        if stack is not None:
+            try:
+                stack.close()
+            except (smtplib.SMTPException, OSError):
+                # Already disconnected
+                pass
 
 
 def send_bulk_notification(admin_email, job_id, total_sent, total_failed):
@@ -11,10 +11,12 @@ For backward compatibility and gradual rollout.
 """
 import os
 import logging
-from typing import Dict, Any, Optional, Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
 
 from .iterative_alignment_verifier import (
     extract_field_positions,
+    reference_field_positions,
     calculate_position_difference,
     verify_alignment_with_retries as _original_verify
 )
@@ -65,11 +67,21 @@ def verify_alignment_enhanced(
     if cache:
         cached_data = cache.get(participant_data)
         if cached_data:
-            logger.info("Using cached position data - skipping alignment verification")
-            # Still verify to ensure cache is valid
-            generated_positions = extract_field_positions(generated_cert_path)
-            reference_positions = extract_field_positions(reference_cert_path)
-            diff_result = calculate_position_difference(generated_positions, reference_positions)
+            fingerprint = _file_fingerprint(generated_cert_path)
+            if (fingerprint is not None and cached_data.get('fingerprint') == fingerprint
+                    and cached_data['max_difference_px'] <= tolerance_px):
+                # Same file that was verified when the entry was cached
+                logger.info("Using cached position data - skipping alignment verification")
+                diff_result = {
+                    'max_difference_px': cached_data['max_difference_px'],
+                    'fields': cached_data['fields']
+                }
+            else:
+                # The certificate changed since it was cached, so verify it
+                logger.info("Using cached position data - re-verifying changed certificate")
+                generated_positions = extract_field_positions(generated_cert_path)
+                reference_positions = reference_field_positions(reference_cert_path)
+                diff_result = calculate_position_difference(generated_positions, reference_positions)
             
             if diff_result['max_difference_px'] <= tolerance_px:
                 logger.info(f"✅ Cache hit resulted in perfect alignment!")
@@ -80,12 +92,14 @@ def verify_alignment_enhanced(
                     'max_difference_px': diff_result['max_difference_px'],
                     'fields': diff_result['fields'],
                     'message': f"CACHED: Perfect alignment from cache (diff={diff_result['max_difference_px']:.4f}px)",
-                    'used_cache': True,
-                    'cache_age_seconds': int((datetime.now() - cached_time).total_seconds())
+                    'used_cache': True
                 }
+                if 'cached_at' in cached_data:
+                    cached_time = datetime.fromisoformat(cached_data['cached_at'])
+                    result['cache_age_seconds'] = int((datetime.now() - cached_time).total_seconds())
                 
                 if stats_tracker:
-                    stats_tracker.record_verification(
+                    stats_tracker.record_verification_async(
                         passed=True,
                         attempts=1,
                         max_difference_px=diff_result['max_difference_px'],
@@ -129,14 +143,16 @@ def verify_alignment_enhanced(
         cache_data = {
             'max_difference_px': result['max_difference_px'],
             'attempts': result['attempts'],
-            'fields': result['fields']
+            'fields': result['fields'],
+            'fingerprint': _file_fingerprint(generated_cert_path),
+            'cached_at': datetime.now().isoformat()
         }
         cache.set(participant_data, cache_data)
         logger.info("Cached successful alignment data")
     
     # Record statistics
     if stats_tracker:
-        stats_tracker.record_verification(
+        stats_tracker.record_verification_async(
             passed=result['passed'],
             attempts=result['attempts'],
             max_difference_px=result.get('max_difference_px', float('inf')),
@@ -148,6 +164,146 @@ def verify_alignment_enhanced(
     return result
 
 
+def verify_alignment_enhanced_batch(
+    specs: List[Dict[str, Any]],
+    reference_cert_path: str,
+    tolerance_px: float = 0.02,
+    enable_cache: bool = True,
+    enable_stats: bool = True,
+    workers: Optional[int] = None,
+    chunk_size: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    Verify the alignment of many already generated certificates at once.
+    
+    The reference certificate is scanned once and the generated certificates
+    are scanned across worker processes. Each certificate gets a single
+    verification attempt (there is no regeneration), and the position cache
+    and statistics tracker are updated from the calling process.
+    
+    Args:
+        specs: One dict per certificate with 'generated_cert_path' and
+            'participant_data' keys
+        reference_cert_path: Path to reference sample certificate
+        tolerance_px: Maximum allowed difference in pixels (default: 0.02)
+        enable_cache: Cache successful alignments (default: True)
+        enable_stats: Record statistics for every certificate (default: True)
+        workers: Number of worker processes (default: os.cpu_count())
+        chunk_size: Certificates handed to a worker at a time (default: 8)
+        
+    Returns:
+        List of verification results, in the same order as specs
+    """
+    if not os.path.exists(reference_cert_path):
+        raise FileNotFoundError(f"Reference certificate not found: {reference_cert_path}")
+    
+    specs = list(specs)
+    if not specs:
+        return []
+    
+    reference_positions = reference_field_positions(reference_cert_path)
+    paths = [spec['generated_cert_path'] for spec in specs]
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    
+    if workers <= 1:
+        diff_results = [_batch_diff(path, reference_positions) for path in paths]
+    else:
+        chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+        diff_results = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_verify_worker,
+            initargs=(reference_positions,)
+        ) as executor:
+            for chunk_results in executor.map(_batch_verify_chunk, chunks):
+                diff_results.extend(chunk_results)
+    
+    cache = get_position_cache() if enable_cache else None
+    stats_tracker = get_alignment_stats() if enable_stats else None
+    
+    results = []
+    for spec, diff_result in zip(specs, diff_results):
+        if diff_result is None:
+            result = {
+                'passed': False,
+                'attempts': 1,
+                'max_difference_px': float('inf'),
+                'fields': {},
+                'message': f"Certificate file not found: {spec['generated_cert_path']}"
+            }
+        else:
+            max_diff = diff_result['max_difference_px']
+            passed = max_diff <= tolerance_px
+            if passed:
+                message = f"PASSED: Max difference: {max_diff:.4f} px (<= {tolerance_px} px)"
+            else:
+                message = f"FAILED: Max difference: {max_diff:.4f} px (tolerance: {tolerance_px} px)"
+            result = {
+                'passed': passed,
+                'attempts': 1,
+                'max_difference_px': max_diff,
+                'fields': diff_result['fields'],
+                'message': message,
+                'tolerance_px': tolerance_px
+            }
+        
+        if cache and result['passed']:
+            cache.set(spec['participant_data'], {
+                'max_difference_px': result['max_difference_px'],
+                'attempts': result['attempts'],
+                'fields': result['fields'],
+                'fingerprint': _file_fingerprint(spec['generated_cert_path']),
+                'cached_at': datetime.now().isoformat()
+            })
+        
+        if stats_tracker:
+            stats_tracker.record_verification_async(
+                passed=result['passed'],
+                attempts=result['attempts'],
+                max_difference_px=result['max_difference_px'],
+                field_differences=result['fields'],
+                tolerance_px=tolerance_px,
+                participant_data=spec['participant_data']
+            )
+        
+        results.append(result)
+    
+    return results
+
+
+def _file_fingerprint(path: str) -> Optional[List[int]]:
+    """[mtime_ns, size] of a file (a list so it round-trips through JSON), or None."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+# Per-process reference positions, set by _init_batch_verify_worker
+_batch_reference_positions = None
+
+
+def _init_batch_verify_worker(reference_positions):
+    """Store the reference positions once per worker process."""
+    global _batch_reference_positions
+    _batch_reference_positions = reference_positions
+
+
+def _batch_verify_chunk(paths):
+    """Verify one chunk of a verify_alignment_enhanced_batch call."""
+    return [_batch_diff(path, _batch_reference_positions) for path in paths]
+
+
+def _batch_diff(generated_cert_path, reference_positions):
+    """Position difference for one generated certificate, or None if missing."""
+    try:
+        generated_positions = extract_field_positions(generated_cert_path)
+    except FileNotFoundError:
+        return None
+    return calculate_position_difference(generated_positions, reference_positions)
+
+
 def _verify_with_progressive_refinement(
     generated_cert_path: str,
     reference_cert_path: str,
@@ -167,7 +323,7 @@ def _verify_with_progressive_refinement(
     
     # Extract reference positions once
     logger.info(f"Extracting reference positions from {reference_cert_path}")
-    reference_positions = extract_field_positions(reference_cert_path)
+    reference_positions = reference_field_positions(reference_cert_path)
     
     # Track all attempts
     all_attempts = []
@@ -181,8 +337,11 @@ def _verify_with_progressive_refinement(
             
             logger.info(f"Progressive refinement attempt {attempt}/{max_attempts}")
             
-            # Check if generated certificate exists
-            if not os.path.exists(generated_cert_path):
+            # Extract generated positions; opening the file doubles as the
+            # existence check, so a missing certificate costs no extra stat
+            try:
+                generated_positions = extract_field_positions(generated_cert_path)
+            except FileNotFoundError:
                 logger.warning(f"Generated certificate not found: {generated_cert_path}")
                 if attempt < max_attempts:
                     logger.info("Regenerating certificate...")
@@ -197,9 +356,6 @@ def _verify_with_progressive_refinement(
                         'message': f'Certificate file not found after {attempt} attempts'
                     }
             
-            # Extract generated positions
-            generated_positions = extract_field_positions(generated_cert_path)
-            
             # Calculate differences
             diff_result = calculate_position_difference(generated_positions, reference_positions)
             max_diff = diff_result['max_difference_px']
@@ -250,8 +406,10 @@ def _verify_with_progressive_refinement(
                     'refiner_stats': refiner.get_stats()
                 }
             
-            # Check if we should abort due to non-convergence
-            if refiner.should_abort():
+            # Check if we should abort due to non-convergence, or because
+            # the difference has stopped shrinking between attempts
+            refiner.record_difference(max_diff)
+            if refiner.should_abort() or refiner.is_stalled():
                 message = f"Progressive refinement not converging after {attempt} attempts. Using best available."
                 logger.warning(message)
                 
@@ -5,8 +5,9 @@ Some safe auto-fixes are attempted (for example, fixing template paths that refe
 files existing in the uploads folder but stored with different paths).
 """
 import os
+import threading
 import traceback
-from app.models import Event, db
+from app.models.sqlite_models import Event, db
 
 
 def _resolve_uploads(app):
@@ -31,6 +32,31 @@ def check_env(app):
     return {'ok': len(issues) == 0, 'details': issues}
 
 
+def _index_uploads(upload_abs):
+    """Map each file basename under upload_abs to its paths, in walk order.
+
+    Uses os.scandir directly so file types come from the directory listing
+    instead of a stat per entry. Each directory's files are indexed before
+    its subdirectories are visited, matching os.walk's top-down order.
+    """
+    by_base = {}
+    stack = [upload_abs]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        by_base.setdefault(entry.name, []).append(entry.path)
+        except OSError:
+            continue
+        # Reversed so subdirectories are popped in listing order
+        stack.extend(reversed(subdirs))
+    return by_base
+
+
 def check_uploads_and_templates(app, auto_fix=True):
     """Check uploads folder and Event.template_path values.
 
@@ -43,58 +69,75 @@ def check_uploads_and_templates(app, auto_fix=True):
     fixes = []
     upload_folder = _resolve_uploads(app)
     upload_abs = os.path.abspath(upload_folder)
+    upload_prefixes = (upload_folder + os.sep, upload_folder + '/')
 
     # Ensure upload folder exists
     if not os.path.exists(upload_abs):
         results.append({'level': 'error', 'message': f'Upload folder not found: {upload_abs}'})
         return {'ok': False, 'results': results, 'fixes': fixes}
 
-    events = Event.query.all()
-    for e in events:
-        tpl = e.template_path
+    # Basename -> paths under the uploads folder, built on the first
+    # missing template so the tree is walked at most once per check
+    by_base = None
+
+    # Only id and template_path are needed, so stream those columns rather
+    # than building a full Event object per row
+    updates = []
+    rows = db.session.query(Event.id, Event.template_path).yield_per(500)
+    for event_id, tpl in rows:
         if not tpl:
-            results.append({'event': e.id, 'status': 'missing', 'message': 'No template_path set'})
+            results.append({'event': event_id, 'status': 'missing', 'message': 'No template_path set'})
             continue
 
         # Resolve candidate path
         if os.path.isabs(tpl):
             candidate = tpl
-        elif tpl.startswith(upload_folder + os.sep) or tpl.startswith(upload_folder + '/'):
+        elif tpl.startswith(upload_prefixes):
             candidate = os.path.abspath(tpl)
         else:
             candidate = os.path.join(upload_abs, tpl)
 
         if os.path.exists(candidate):
-            results.append({'event': e.id, 'status': 'ok', 'path': candidate})
+            results.append({'event': event_id, 'status': 'ok', 'path': candidate})
             continue
 
         # Attempt to auto-fix by finding a file with the same basename in uploads
+        if by_base is None:
+            by_base = _index_uploads(upload_abs)
         base = os.path.basename(tpl)
-        found = None
-        for root, _, files in os.walk(upload_abs):
-            if base in files:
-                found = os.path.join(root, base)
-                break
+        found = by_base.get(base, [None])[0]
 
         if found:
-            results.append({'event': e.id, 'status': 'fixed', 'old': tpl, 'new': found})
+            results.append({'event': event_id, 'status': 'fixed', 'old': tpl, 'new': found})
             if auto_fix:
                 # Save the fixed path as relative to upload folder where possible
                 rel = os.path.relpath(found, upload_abs)
-                e.template_path = os.path.join(upload_folder, rel).replace('\\', '/')
-                db.session.add(e)
-                db.session.commit()
-                fixes.append({'event': e.id, 'old': tpl, 'new': e.template_path})
+                new_path = os.path.join(upload_folder, rel).replace('\\', '/')
+                updates.append({'id': event_id, 'template_path': new_path})
+                fixes.append({'event': event_id, 'old': tpl, 'new': new_path})
         else:
-            results.append({'event': e.id, 'status': 'missing_file', 'message': f'Template not found for {tpl}'})
+            results.append({'event': event_id, 'status': 'missing_file', 'message': f'Template not found for {tpl}'})
+
+    if updates:
+        db.session.bulk_update_mappings(Event, updates)
+        db.session.commit()
 
     ok = all(r.get('status') in ('ok', 'fixed') for r in results if 'status' in r)
     return {'ok': ok, 'results': results, 'fixes': fixes}
 
 
+# Logged-in SMTP connections kept by check_smtp, keyed by server settings and
+# credentials, so repeated checks skip the connect/TLS/LOGIN round trips
+_smtp_pool = {}
+_smtp_pool_lock = threading.Lock()
+
+
 def check_smtp(app, timeout=10):
     """Attempt to connect to the SMTP server with provided credentials.
 
+    A connection that logged in successfully is kept open and re-checked
+    with NOOP on the next call; it is replaced if the server dropped it.
+
     Returns {'ok': bool, 'message': str}.
     """
     import smtplib
@@ -103,21 +146,47 @@ def check_smtp(app, timeout=10):
     port = app.config.get('MAIL_PORT') or 587
     username = app.config.get('MAIL_USERNAME')
     password = app.config.get('MAIL_PASSWORD')
+    use_tls = bool(app.config.get('MAIL_USE_TLS'))
 
     if not username or not password:
         return {'ok': False, 'message': 'MAIL_USERNAME or MAIL_PASSWORD not set; skipping SMTP test.'}
 
+    key = (server, port, use_tls, username, password)
+    # The lock only guards the pool itself; network round trips happen
+    # outside it so one slow server does not block other checks
+    with _smtp_pool_lock:
+        smtp = _smtp_pool.pop(key, None)
+    if smtp is not None:
+        try:
+            if smtp.noop()[0] == 250:
+                _return_to_pool(key, smtp)
+                return {'ok': True, 'message': 'SMTP login successful'}
+        except (smtplib.SMTPException, OSError):
+            pass
+        smtp.close()
+
+    smtp = None
     try:
         smtp = smtplib.SMTP(server, port, timeout=timeout)
         smtp.ehlo()
-        if app.config.get('MAIL_USE_TLS'):
+        if use_tls:
             smtp.starttls()
             smtp.ehlo()
         smtp.login(username, password)
-        smtp.quit()
-        return {'ok': True, 'message': 'SMTP login successful'}
     except Exception as e:
+        if smtp is not None:
+            smtp.close()
         return {'ok': False, 'message': f'SMTP check failed: {str(e)}', 'trace': traceback.format_exc()}
+    _return_to_pool(key, smtp)
+    return {'ok': True, 'message': 'SMTP login successful'}
+
+
+def _return_to_pool(key, smtp):
+    """Keep smtp for the next check, or close it if another check got there first."""
+    with _smtp_pool_lock:
+        kept = _smtp_pool.setdefault(key, smtp)
+    if kept is not smtp:
+        smtp.close()
 
 
 def run_all_checks(app, auto_fix=True):
@@ -1,35 +1,219 @@
 """GOONJ Certificate Renderer - Renders participant data on GOONJ template."""
 import os
 import json
-from PIL import Image, ImageDraw, ImageFont
+import mmap
+import hashlib
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from PIL import Image
 from datetime import datetime
 import logging
-from .text_align import draw_text_centered, get_font
+from typing import NamedTuple, Tuple
+from .text_align import draw_text_tiled, get_font
 
 logger = logging.getLogger(__name__)
 
+# Quality used for lossy output formats (JPEG/WebP)
+LOSSY_QUALITY = 90
+
+# Suffix of the per-certificate JSON recording where each field was drawn
+POSITIONS_SUFFIX = '.pos.json'
+
+# Translation table for ASCII names: keep letters, digits, '-' and '_',
+# map spaces and everything else to '_'
+_ASCII_FILENAME_TABLE = {
+    i: '_' for i in range(128) if not (chr(i).isalnum() or chr(i) in '-_')
+}
+
+
+def _safe_filename_part(name):
+    """Sanitize a participant name for use in a filename."""
+    if name.isascii():
+        # Fast path: a single C-level translate
+        return name.translate(_ASCII_FILENAME_TABLE)
+    safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in name)
+    return safe_name.replace(' ', '_')
+
+
+def _temp_path_for(dst):
+    """Temp path next to dst, unique per process and thread."""
+    return f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _copy_atomic(src, dst):
+    """Atomically place a copy of src at dst.
+    
+    Render cache entries and output files are always copies, never hard
+    links: a shared inode would let a later write to the output path
+    silently change the cached certificate of a different cache key.
+    """
+    tmp_path = _temp_path_for(dst)
+    try:
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _prune_cache(cache_dir, max_entries):
+    """Delete the least recently used render cache entries beyond max_entries.
+    
+    Entries are touched on every hit, so their mtime orders them by last use.
+    In-flight temp files are left alone.
+    """
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.tmp') or not entry.is_file():
+                continue
+            try:
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+            except FileNotFoundError:
+                continue
+    if len(entries) <= max_entries:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - max_entries]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Already pruned by another renderer
+            pass
+
+
+class FieldSpec(NamedTuple):
+    """Placement of one text field on the template."""
+    x: int
+    y: int
+    base_font_size: int
+    color: Tuple[int, int, int]
+    baseline_offset: float = 0
+
+
+# Decoded templates shared by renderers in this process, keyed by path and
+# validated against the file's size/mtime. Treat the images as read-only.
+_template_cache = {}
+
+
+def _load_template(template_path):
+    """Load the template as an RGB image, reusing decoded copies.
+
+    Renderers for an unchanged template in the same process share one
+    decoded image. See _read_template for the on-disk sidecar.
+
+    Args:
+        template_path: Path to the template image
+
+    Returns:
+        RGB PIL Image of the template (shared; copy before drawing on it)
+    """
+    stat = os.stat(template_path)
+    source = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    cached = _template_cache.get(template_path)
+    if cached is not None and cached[0] == source:
+        return cached[1]
+    template = _read_template(template_path, source)
+    _template_cache[template_path] = (source, template)
+    return template
+
+
+def _read_template(template_path, source):
+    """Read the template as an RGB image, reusing a decoded raw sidecar.
+
+    The first load decodes the PNG and writes its raw RGB pixels to
+    ``<template>.raw.rgb`` plus a ``.raw.meta`` JSON file recording the
+    source's size/mtime and the image dimensions. Later loads (including
+    after a process restart) memory-map the raw file instead of running
+    the PNG decoder. The sidecar is rebuilt whenever the template changes;
+    if it cannot be read or written the template is decoded normally.
+
+    Args:
+        template_path: Path to the template image
+        source: Size/mtime of the template file, as stored in the meta file
+
+    Returns:
+        RGB PIL Image of the template
+    """
+    raw_path = template_path + '.raw.rgb'
+    meta_path = template_path + '.raw.meta'
+
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        if meta.get('source') == source and meta.get('mode') == 'RGB':
+            size = (meta['width'], meta['height'])
+            with open(raw_path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(mm) == size[0] * size[1] * 3:
+                return Image.frombuffer('RGB', size, mm, 'raw', 'RGB', 0, 1)
+            mm.close()
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    template = Image.open(template_path).convert("RGB")
+
+    try:
+        tmp_path = f"{raw_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(template.tobytes())
+        os.replace(tmp_path, raw_path)
+        with open(meta_path, 'w') as f:
+            json.dump({
+                'source': source,
+                'width': template.width,
+                'height': template.height,
+                'mode': 'RGB',
+            }, f)
+    except OSError as e:
+        logger.debug(f"Could not write raw template cache for {template_path}: {e}")
+
+    return template
+
 
 class GOONJRenderer:
     """Render GOONJ certificates with participant information."""
     
-    def __init__(self, template_path, output_folder='generated_certificates'):
+    def __init__(self, template_path, output_folder='generated_certificates', png_compress_level=1,
+                 cache_dir=None, write_positions=False, cache_max_entries=1000):
         """Initialize the GOONJ renderer.
         
         Args:
             template_path: Path to the GOONJ certificate template image
             output_folder: Folder to save generated certificates
+            png_compress_level: zlib level for PNG output, 0-9 (default: 1).
+                Level 1 encodes several times faster than Pillow's default of 6
+                for a slightly larger file; use 6-9 for archival copies.
+            cache_dir: Optional folder for a content-addressed render cache.
+                Certificates whose rendered text, format and template match
+                an earlier render are copied from the cache instead of
+                being drawn and encoded again (default: disabled).
+            cache_max_entries: Most certificates kept in cache_dir; the least
+                recently used are deleted after each store (default: 1000).
+            write_positions: Also write <certificate>.pos.json with the
+                normalized centre of each drawn field's text box, which
+                certificate_validator uses instead of OCR (default: False).
         """
         self.template_path = template_path
         self.output_folder = output_folder
+        self.png_compress_level = png_compress_level
+        self.cache_dir = cache_dir
+        self.cache_max_entries = cache_max_entries
+        self.write_positions = write_positions
         
         # Create output folder if it doesn't exist
         os.makedirs(output_folder, exist_ok=True)
-        
-        # Load template
-        if not os.path.exists(template_path):
-            raise FileNotFoundError(f"GOONJ template not found at: {template_path}")
-        
-        self.template = Image.open(template_path).convert("RGB")
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        
+        # Load template (decoded once and memory-mapped from a raw sidecar on
+        # later loads); its stat doubles as the existence check
+        try:
+            self.template = _load_template(template_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"GOONJ template not found at: {template_path}") from None
         width, height = self.template.size
         
         # Store dimensions
@@ -42,34 +226,53 @@ class GOONJRenderer:
         # Define bounding boxes for GOONJ certificate (supports three fields only)
         # Positions as percentage of template height for vertical placement
         # NAME at ~33% (32-35%), EVENT at ~42% (41-43%), ORGANISED BY at ~51% (49-52%)
-        self.name_bbox = {
-            'x': width // 2,
-            'y': int(height * self.field_offsets['name']['y']),
-            'base_font_size': int(height * 0.05),  # ~5% of height
-            'color': '#000000',  # Pure black
-            'baseline_offset': self.field_offsets['name'].get('baseline_offset', 0)
-        }
+        # Colour is pure black for all fields
+        text_color = self._hex_to_rgb('#000000')
+        self.name_bbox = FieldSpec(
+            x=width // 2,
+            y=int(height * self.field_offsets['name']['y']),
+            base_font_size=int(height * 0.05),  # ~5% of height
+            color=text_color,
+            baseline_offset=self.field_offsets['name'].get('baseline_offset', 0)
+        )
         
-        self.event_bbox = {
-            'x': width // 2,
-            'y': int(height * self.field_offsets['event']['y']),
-            'base_font_size': int(height * 0.042),  # ~4.2% of height
-            'color': '#000000',  # Pure black
-            'baseline_offset': self.field_offsets['event'].get('baseline_offset', 0)
-        }
+        self.event_bbox = FieldSpec(
+            x=width // 2,
+            y=int(height * self.field_offsets['event']['y']),
+            base_font_size=int(height * 0.042),  # ~4.2% of height
+            color=text_color,
+            baseline_offset=self.field_offsets['event'].get('baseline_offset', 0)
+        )
         
-        self.organiser_bbox = {
-            'x': width // 2,
-            'y': int(height * self.field_offsets['organiser']['y']),
-            'base_font_size': int(height * 0.042),  # ~4.2% of height
-            'color': '#000000',  # Pure black
-            'baseline_offset': self.field_offsets['organiser'].get('baseline_offset', 0)
-        }
+        self.organiser_bbox = FieldSpec(
+            x=width // 2,
+            y=int(height * self.field_offsets['organiser']['y']),
+            base_font_size=int(height * 0.042),  # ~4.2% of height
+            color=text_color,
+            baseline_offset=self.field_offsets['organiser'].get('baseline_offset', 0)
+        )
         
         # Max width for text (80-85% of image width)
         self.max_text_width = int(width * 0.825)  # 82.5% of width
         
         self._load_fonts()
+        
+        # Draw plan: everything per field that does not depend on the
+        # participant, resolved once (field order is name, event, organiser)
+        self._field_plan = tuple(
+            (spec, self._get_font(spec.base_font_size))
+            for spec in (self.name_bbox, self.event_bbox, self.organiser_bbox)
+        )
+        
+        # Everything besides the participant's text that affects the output;
+        # part of every render cache key
+        if cache_dir:
+            stat = os.stat(template_path)
+            self._render_signature = [
+                os.path.abspath(template_path), stat.st_size, stat.st_mtime_ns,
+                self.font_path, [spec for spec, _ in self._field_plan],
+                self.max_text_width, self.png_compress_level, LOSSY_QUALITY,
+            ]
     
     def _load_field_offsets(self):
         """Load field position offsets from JSON configuration.
@@ -88,20 +291,19 @@ class GOONJRenderer:
         template_dir = os.path.dirname(self.template_path)
         offsets_path = os.path.join(template_dir, 'goonj_template_offsets.json')
         
-        if os.path.exists(offsets_path):
-            try:
-                with open(offsets_path, 'r') as f:
-                    data = json.load(f)
-                    if 'fields' in data:
-                        # Update offsets with values from JSON
-                        for field in ['name', 'event', 'organiser']:
-                            if field in data['fields']:
-                                self.field_offsets[field].update(data['fields'][field])
-                        logger.info(f"Loaded field offsets from {offsets_path}")
-            except Exception as e:
-                logger.warning(f"Could not load field offsets from {offsets_path}: {e}, using defaults")
-        else:
+        try:
+            with open(offsets_path, 'r') as f:
+                data = json.load(f)
+                if 'fields' in data:
+                    # Update offsets with values from JSON
+                    for field in ['name', 'event', 'organiser']:
+                        if field in data['fields']:
+                            self.field_offsets[field].update(data['fields'][field])
+                    logger.info(f"Loaded field offsets from {offsets_path}")
+        except FileNotFoundError:
             logger.debug(f"Offsets file not found at {offsets_path}, using default positions")
+        except Exception as e:
+            logger.warning(f"Could not load field offsets from {offsets_path}: {e}, using defaults")
     
     def _load_fonts(self):
         """Load the bundled ARIALBD.TTF font for text rendering.
@@ -131,30 +333,32 @@ class GOONJRenderer:
         """Get a font at the specified size using the shared helper."""
         return get_font(self.font_path, size)
     
-    def _fit_text_to_width(self, draw, text, base_font_size, max_width):
+    def _fit_text_to_width(self, text, base_font_size, max_width, base_font=None):
         """Scale down text to fit within max_width.
         
+        Measures with the font's own bbox so no ImageDraw context is needed.
+        
         Args:
-            draw: ImageDraw object
             text: Text to fit
             base_font_size: Starting font size
             max_width: Maximum width in pixels
+            base_font: Font already loaded at base_font_size, if available
             
         Returns:
             Font object that fits the text within max_width
         """
         font_size = base_font_size
-        font = self._get_font(font_size)
+        font = base_font or self._get_font(font_size)
         
         # Get text width
-        bbox = draw.textbbox((0, 0), text, font=font)
+        bbox = font.getbbox(text)
         text_width = bbox[2] - bbox[0]
         
         # Scale down if needed
         while text_width > max_width and font_size > 10:
             font_size -= 1
             font = self._get_font(font_size)
-            bbox = draw.textbbox((0, 0), text, font=font)
+            bbox = font.getbbox(text)
             text_width = bbox[2] - bbox[0]
         
         return font
@@ -166,15 +370,141 @@ class GOONJRenderer:
             participant_data: Dictionary with participant information
                 Required: 'name'
                 Optional: 'event', 'organiser' (or 'organizer')
-            output_format: Output format ('png' or 'pdf')
+            output_format: Output format ('png' or 'pdf'). 'jpg' and 'webp' are
+                also accepted for bulk issuance that tolerates lossy output;
+                they encode faster but will not pass pixel-exact alignment checks.
+        
+        Returns:
+            Path to the generated certificate file
+        """
+        return self._render_one(None, participant_data, output_format)
+    
+    def render_batch(self, participants, output_format='png', jobs=1, threads=1):
+        """Render certificates for several participants.
+        
+        A single working canvas is allocated per batch (or per worker chunk)
+        and reset to the template before each certificate, instead of copying
+        the template into a fresh image per participant.
+        
+        Args:
+            participants: List of participant dictionaries (see render)
+            output_format: Output format ('png', 'pdf', 'jpg' or 'webp')
+            jobs: Number of worker processes. 1 (default) renders in this
+                process; None uses os.cpu_count(). Worth raising only for
+                large batches, since each worker loads its own renderer.
+            threads: Number of threads to render with when jobs is 1. Pillow
+                releases the GIL while pasting and encoding, which is most of
+                the per-certificate cost, so threads overlap well without the
+                start-up cost of processes (default: 1, no threads).
+        
+        Returns:
+            List of paths to the generated certificate files, in input order
+        """
+        participants = list(participants)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        jobs = min(jobs, len(participants))
+        threads = min(threads, len(participants))
+        if jobs <= 1 and threads <= 1:
+            return self._render_many(participants, output_format, timestamp)
+        
+        paths = []
+        if jobs > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_batch_worker,
+                initargs=(self.template_path, self.output_folder, self.png_compress_level,
+                          self.cache_dir, self.write_positions, self.cache_max_entries)
+            )
+            chunks = _batch_chunks(participants, jobs, output_format, timestamp)
+            render_chunk = _render_batch_chunk
+        else:
+            # Each thread draws on its own canvas; fonts and text tiles are shared
+            executor = ThreadPoolExecutor(max_workers=threads)
+            chunks = _batch_chunks(participants, threads, output_format, timestamp)
+            render_chunk = self._render_chunk
+        
+        with executor:
+            for chunk_paths in executor.map(render_chunk, chunks):
+                paths.extend(chunk_paths)
+        return paths
+    
+    def _render_chunk(self, chunk):
+        """Render one (participants, output_format, timestamp, start) batch chunk."""
+        return self._render_many(*chunk)
+    
+    def _render_many(self, participants, output_format, timestamp, start=0):
+        """Render participants sequentially on one reused canvas.
+        
+        Each certificate's position in the batch (counting from start) goes
+        into its filename, so participants whose names sanitise to the same
+        string do not overwrite each other within one batch timestamp.
+        """
+        canvas = Image.new(self.template.mode, self.template.size)
+        paths = []
+        for index, participant_data in enumerate(participants, start):
+            paths.append(self._render_one(canvas, participant_data, output_format, timestamp, index))
+        return paths
+    
+    def _render_one(self, canvas, participant_data, output_format, timestamp=None, index=None):
+        """Draw and save one certificate, or copy it from the render cache.
+        
+        Args:
+            canvas: Reusable image to reset and draw on, or None to draw on a
+                fresh copy of the template
+            participant_data: Participant dictionary (see render)
+            output_format: Output format
+            timestamp: Filename timestamp (see _save)
+            index: Position in a batch, added to the filename (see _save)
         
         Returns:
             Path to the generated certificate file
         """
-        # Create a copy of the template
-        cert_image = self.template.copy()
-        draw = ImageDraw.Draw(cert_image)
+        cache_path = self._cache_path(participant_data, output_format)
+        if cache_path and os.path.exists(cache_path):
+            output_path = self._output_path(participant_data, output_format, timestamp, index)
+            try:
+                _copy_atomic(cache_path, output_path)
+                # Mark the entry as recently used for _prune_cache
+                os.utime(cache_path)
+            except FileNotFoundError:
+                # Pruned by another renderer since the check; draw it instead
+                pass
+            else:
+                logger.info(f"Reused cached GOONJ certificate: {output_path}")
+                if self.write_positions:
+                    self._write_positions(participant_data, output_path)
+                return output_path
+        
+        if canvas is None:
+            canvas = self.template.copy()
+        else:
+            canvas.paste(self.template)
+        self._draw_fields(canvas, participant_data)
+        output_path = self._save(canvas, participant_data, output_format, timestamp=timestamp, index=index)
+        if self.write_positions:
+            self._write_positions(participant_data, output_path)
         
+        if cache_path:
+            try:
+                _copy_atomic(output_path, cache_path)
+                _prune_cache(self.cache_dir, self.cache_max_entries)
+            except OSError as e:
+                logger.warning(f"Could not add certificate to render cache: {e}")
+        return output_path
+    
+    def _cache_path(self, participant_data, output_format):
+        """Return the render cache file for this certificate, or None if disabled."""
+        if not self.cache_dir:
+            return None
+        fmt = output_format.lower()
+        key_data = [self._render_signature, self._field_texts(participant_data), fmt]
+        key = hashlib.blake2b(json.dumps(key_data).encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.{fmt}")
+    
+    def _field_texts(self, participant_data):
+        """Return the (name, event, organiser) strings as they are drawn."""
         # Extract participant data (only three fields supported)
         name = participant_data.get('name', 'Participant')
         event = participant_data.get('event', 'GOONJ')
@@ -182,90 +512,126 @@ class GOONJRenderer:
         organiser = participant_data.get('organiser') or participant_data.get('organizer', 'AMA')
         
         # Uppercase all fields as per specification
-        name_upper = name.upper()
-        event_upper = event.upper()
-        organiser_upper = organiser.upper()
-        
-        # Color is pure black for all fields
-        text_color = self._hex_to_rgb(self.name_bbox['color'])
-        
-        # Draw participant name (centered, ~33% down)
-        name_font = self._fit_text_to_width(
-            draw, 
-            name_upper, 
-            self.name_bbox['base_font_size'],
-            self.max_text_width
-        )
-        self._draw_centered_text(
-            draw, 
-            name_upper, 
-            self.name_bbox['x'], 
-            self.name_bbox['y'],
-            name_font,
-            text_color,
-            baseline_offset=self.name_bbox['baseline_offset']
-        )
-        
-        # Draw event name (centered, ~42% down)
-        event_font = self._fit_text_to_width(
-            draw,
-            event_upper,
-            self.event_bbox['base_font_size'],
-            self.max_text_width
-        )
-        self._draw_centered_text(
-            draw,
-            event_upper,
-            self.event_bbox['x'],
-            self.event_bbox['y'],
-            event_font,
-            text_color,
-            baseline_offset=self.event_bbox['baseline_offset']
-        )
+        return (name.upper(), event.upper(), organiser.upper())
+    
+    def _draw_fields(self, cert_image, participant_data):
+        """Draw the name, event and organiser fields onto cert_image."""
+        # Drawn top to bottom at ~33%, ~42% and ~51% of the template height
+        texts = self._field_texts(participant_data)
+        
+        for text, (spec, base_font) in zip(texts, self._field_plan):
+            font = self._fit_text_to_width(
+                text, spec.base_font_size, self.max_text_width, base_font
+            )
+            self._draw_centered_text(
+                cert_image,
+                text,
+                spec.x,
+                spec.y,
+                font,
+                spec.color,
+                baseline_offset=spec.baseline_offset
+            )
+    
+    def _field_positions(self, participant_data):
+        """Return the normalized centre of each field's text box as drawn.
         
-        # Draw organiser (centered, ~51% down)
-        organiser_font = self._fit_text_to_width(
-            draw,
-            organiser_upper,
-            self.organiser_bbox['base_font_size'],
-            self.max_text_width
-        )
-        self._draw_centered_text(
-            draw,
-            organiser_upper,
-            self.organiser_bbox['x'],
-            self.organiser_bbox['y'],
-            organiser_font,
-            text_color,
-            baseline_offset=self.organiser_bbox['baseline_offset']
-        )
+        Uses the same fitted font, anchor and baseline offset as
+        _draw_fields, so the boxes are the ones the glyphs were rendered into.
+        """
+        texts = self._field_texts(participant_data)
+        positions = {}
+        for field_name, text, (spec, base_font) in zip(
+            ('name', 'event', 'organiser'), texts, self._field_plan
+        ):
+            font = self._fit_text_to_width(
+                text, spec.base_font_size, self.max_text_width, base_font
+            )
+            # draw_text_tiled centres text with the middle-middle anchor
+            left, top, right, bottom = font.getbbox(text, anchor='mm')
+            positions[field_name] = {
+                'x': (spec.x + (left + right) / 2) / self.width,
+                'y': (spec.y + spec.baseline_offset + (top + bottom) / 2) / self.height
+            }
+        return positions
+    
+    def _write_positions(self, participant_data, output_path):
+        """Write the drawn field positions next to a rendered certificate."""
+        try:
+            with open(output_path + POSITIONS_SUFFIX, 'w') as f:
+                json.dump(self._field_positions(participant_data), f)
+        except OSError as e:
+            logger.warning(f"Could not write field positions for {output_path}: {e}")
+    
+    def _save(self, cert_image, participant_data, output_format, timestamp=None, index=None):
+        """Save a rendered certificate and return its path.
         
-        # Generate filename
-        safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in name)
-        safe_name = safe_name.replace(' ', '_')
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"goonj_cert_{safe_name}_{timestamp}.{output_format}"
-        output_path = os.path.join(self.output_folder, filename)
+        Args:
+            cert_image: Rendered certificate image
+            participant_data: Participant dictionary (used for the filename)
+            output_format: Output format
+            timestamp: Filename timestamp; computed now if not given, so a
+                batch can format the clock once for all its certificates
+            index: Position in a batch, appended to the filename so it stays
+                unique when the timestamp is shared (default: none)
+        """
+        output_path = self._output_path(participant_data, output_format, timestamp, index)
+        
+        # Encode to a temp file and move it into place, so a save never
+        # writes through an existing file at output_path
+        tmp_path = _temp_path_for(output_path)
+        try:
+            self._encode(cert_image, tmp_path, output_format)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
         
-        # Save the certificate
-        if output_format.lower() == 'pdf':
+        logger.info(f"Generated GOONJ certificate: {output_path}")
+        return output_path
+    
+    def _encode(self, cert_image, path, output_format):
+        """Encode cert_image to path in output_format."""
+        fmt = output_format.lower()
+        if fmt == 'pdf':
             # Convert to PDF
             cert_image_rgb = cert_image.convert('RGB')
-            cert_image_rgb.save(output_path, 'PDF', resolution=100.0)
+            cert_image_rgb.save(path, 'PDF', resolution=100.0)
+        elif fmt in ('jpg', 'jpeg'):
+            # Lossy, fastest encoder; only for callers that accept artefacts
+            cert_image.convert('RGB').save(path, 'JPEG', quality=LOSSY_QUALITY, optimize=False)
+        elif fmt == 'webp':
+            # Lossy WebP with the fastest encoder profile
+            cert_image.convert('RGB').save(path, 'WEBP', quality=LOSSY_QUALITY, method=0)
         else:
-            # Save as PNG
-            cert_image.save(output_path, 'PNG')
+            # Save as PNG (fast zlib level, no optimize pass)
+            cert_image.save(
+                path, 'PNG',
+                compress_level=self.png_compress_level, optimize=False
+            )
+    
+    def _output_path(self, participant_data, output_format, timestamp=None, index=None):
+        """Build the output path for a participant's certificate."""
+        name = participant_data.get('name', 'Participant')
         
-        logger.info(f"Generated GOONJ certificate: {output_path}")
-        return output_path
+        # Generate filename
+        safe_name = _safe_filename_part(name)
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if index is not None:
+            timestamp = f"{timestamp}_{index}"
+        filename = f"goonj_cert_{safe_name}_{timestamp}.{output_format}"
+        return os.path.join(self.output_folder, filename)
     
-    def _draw_centered_text(self, draw, text, x, y, font, color, baseline_offset=0):
+    def _draw_centered_text(self, image, text, x, y, font, color, baseline_offset=0):
         """Draw text centered at the given position using shared alignment helper.
         
-        Uses draw_text_centered from text_align module for consistent alignment.
+        Uses draw_text_tiled from text_align module, which rasterizes the text
+        into a small tile and composites it onto the certificate in one paste.
         """
-        draw_text_centered(
-            draw, 
+        draw_text_tiled(
+            image, 
             (x, y), 
             text, 
             font, 
@@ -273,3 +639,36 @@ class GOONJRenderer:
             align="center",
             baseline_offset=baseline_offset
         )
+
+
+def _batch_chunks(participants, workers, output_format, timestamp):
+    """Split a batch into contiguous chunks, about four per worker.
+    
+    Contiguous chunks keep results in input order and let each worker reuse
+    one canvas for several certificates.
+    """
+    n_chunks = min(len(participants), workers * 4)
+    chunk_size = -(-len(participants) // n_chunks)
+    return [
+        (participants[i:i + chunk_size], output_format, timestamp, i)
+        for i in range(0, len(participants), chunk_size)
+    ]
+
+
+# Per-process renderer used by render_batch worker processes
+_worker_renderer = None
+
+
+def _init_batch_worker(template_path, output_folder, png_compress_level, cache_dir, write_positions,
+                       cache_max_entries):
+    """Build the renderer once in each render_batch worker process."""
+    global _worker_renderer
+    _worker_renderer = GOONJRenderer(
+        template_path, output_folder, png_compress_level=png_compress_level,
+        cache_dir=cache_dir, write_positions=write_positions, cache_max_entries=cache_max_entries
+    )
+
+
+def _render_batch_chunk(args):
+    """Render one chunk of a parallel render_batch call."""
+    return _worker_renderer._render_chunk(args)
@@ -6,6 +6,7 @@ match the reference sample_certificate.png with sub-pixel precision (<=0.02px di
 """
 import os
 import logging
+from functools import lru_cache
 from PIL import Image
 import numpy as np
 from typing import Dict, Any, Optional, Tuple
@@ -24,9 +25,8 @@ def extract_field_positions(img_path: str) -> Dict[str, Dict[str, float]]:
     Returns:
         Dictionary with field positions and their coordinates
     """
-    img = Image.open(img_path).convert('L')
-    arr = np.array(img)
-    height, width = arr.shape
+    img = Image.open(img_path)
+    width, height = img.size
     
     # Define search windows for the three main fields
     windows = [
@@ -35,14 +35,22 @@ def extract_field_positions(img_path: str) -> Dict[str, Dict[str, float]]:
         (int(height * 0.55), int(height * 0.70), "organiser")
     ]
     
+    # Crop to the rows the windows cover before converting, so only that
+    # band is decoded to grayscale and materialized as an array
+    band_top = min(w[0] for w in windows)
+    band_bottom = max(w[1] for w in windows)
+    arr = np.asarray(img.crop((0, band_top, width, band_bottom)).convert('L'))
+    
     threshold = 200
     min_dark_pixels = 100
     
     results = {}
     
     for y_start, y_end, field_name in windows:
-        slice_arr = arr[y_start:y_end, :]
-        dark_pixels_per_row = np.sum(slice_arr < threshold, axis=1)
+        slice_arr = arr[y_start - band_top:y_end - band_top, :]
+        dark_pixels_per_row = np.add.reduce(
+            np.less(slice_arr, threshold).view(np.uint8), axis=1, dtype=np.int32
+        )
         
         # Find rows with significant text
         text_rows = np.where(dark_pixels_per_row > min_dark_pixels)[0]
@@ -53,8 +61,10 @@ def extract_field_positions(img_path: str) -> Dict[str, Dict[str, float]]:
             text_center = (text_start + text_end) / 2  # Sub-pixel precision
             
             # Calculate horizontal center
-            text_region = arr[text_start:text_end+1, :]
-            dark_pixels_per_col = np.sum(text_region < threshold, axis=0)
+            text_region = arr[text_start - band_top:text_end + 1 - band_top, :]
+            dark_pixels_per_col = np.add.reduce(
+                np.less(text_region, threshold).view(np.uint8), axis=0, dtype=np.int32
+            )
             text_cols = np.where(dark_pixels_per_col > 10)[0]
             
             if len(text_cols) > 0:
@@ -86,6 +96,28 @@ def extract_field_positions(img_path: str) -> Dict[str, Dict[str, float]]:
     return results
 
 
+@lru_cache(maxsize=32)
+def _cached_reference_positions(img_path: str, mtime_ns: int) -> Dict[str, Dict[str, float]]:
+    return extract_field_positions(img_path)
+
+
+def reference_field_positions(img_path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Extract field positions from a reference certificate, memoized per file.
+    
+    Reference images are static, so the scan is cached keyed on path and
+    modification time; replacing the file invalidates the entry. The
+    returned dictionary is shared between callers and must not be mutated.
+    
+    Args:
+        img_path: Path to reference certificate image
+        
+    Returns:
+        Dictionary with field positions, as from extract_field_positions
+    """
+    return _cached_reference_positions(img_path, os.stat(img_path).st_mtime_ns)
+
+
 def calculate_position_difference(
     generated_positions: Dict[str, Dict[str, float]],
     reference_positions: Dict[str, Dict[str, float]]
@@ -190,7 +222,7 @@ def verify_alignment_with_retries(
     
     # Extract reference positions once
     logger.info(f"Extracting reference positions from {reference_cert_path}")
-    reference_positions = extract_field_positions(reference_cert_path)
+    reference_positions = reference_field_positions(reference_cert_path)
     
     # Track all attempts to find the best one
     all_attempts = []
@@ -204,8 +236,11 @@ def verify_alignment_with_retries(
             
             logger.info(f"Alignment verification attempt {attempt}/{max_attempts}")
             
-            # Check if generated certificate exists
-            if not os.path.exists(generated_cert_path):
+            # Extract generated positions; opening the file doubles as the
+            # existence check, so a missing certificate costs no extra stat
+            try:
+                generated_positions = extract_field_positions(generated_cert_path)
+            except FileNotFoundError:
                 logger.warning(f"Generated certificate not found: {generated_cert_path}")
                 if regenerate_func and attempt < max_attempts:
                     logger.info("Regenerating certificate...")
@@ -220,9 +255,6 @@ def verify_alignment_with_retries(
                         'message': f'Certificate file not found after {attempt} attempts'
                     }
             
-            # Extract generated positions
-            generated_positions = extract_field_positions(generated_cert_path)
-            
             # Calculate differences
             diff_result = calculate_position_difference(generated_positions, reference_positions)
             max_diff = diff_result['max_difference_px']
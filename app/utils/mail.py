@@ -1,10 +1,8 @@
 """Mail utility for GOONJ certificates - sends certificates via SMTP."""
 from flask import current_app
-from flask_mail import Message
-from app.utils.email_sender import mail
+from app.utils.email_sender import send_with_retries
 import os
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -112,38 +110,18 @@ AMA Certificate Team
         logger.error(f"Certificate path {cert_path_abs} is outside output folder {output_folder_abs}")
         return {'success': False, 'attempts': 0}
     
-    # Retry loop for sending email
-    for attempt in range(1, max_retries + 1):
-        try:
-            msg = Message(
-                subject=subject,
-                recipients=[recipient_email],
-                body=body
-            )
-            
-            # Set sender if configured
-            if current_app.config.get('MAIL_DEFAULT_SENDER'):
-                msg.sender = current_app.config['MAIL_DEFAULT_SENDER']
-            
-            # Attach certificate
-            with open(cert_path_abs, 'rb') as cert_file:
-                msg.attach(
-                    filename=os.path.basename(cert_path_abs),
-                    content_type='image/png',
-                    data=cert_file.read()
-                )
-            
-            mail.send(msg)
-            logger.info(f"Certificate email sent successfully to {recipient_email} (attempt {attempt}/{max_retries})")
-            return {'success': True, 'attempts': attempt}
-            
-        except Exception as e:
-            logger.warning(f"Attempt {attempt}/{max_retries} - Error sending email to {recipient_email}: {str(e)}")
-            if attempt < max_retries:
-                # Exponential backoff with cap at 60 seconds
-                wait_time = min(2 ** min(attempt, 6), 60)
-                logger.info(f"Waiting {wait_time}s before retry...")
-                time.sleep(wait_time)
-            else:
-                logger.error(f"Failed to send certificate email to {recipient_email} after {max_retries} attempts")
-                return {'success': False, 'attempts': attempt}
+    # Read the certificate once; retries reuse the same bytes
+    try:
+        with open(cert_path_abs, 'rb') as cert_file:
+            cert_bytes = cert_file.read()
+    except OSError as e:
+        logger.error(f"Could not read certificate {cert_path_abs}: {e}")
+        return {'success': False, 'attempts': 0}
+    
+    sent, attempts = send_with_retries(
+        recipient_email, subject, body,
+        attachment_name=os.path.basename(cert_path_abs),
+        attachment_data=cert_bytes,
+        retries=max_retries
+    )
+    return {'success': sent, 'attempts': attempts}
@@ -8,14 +8,35 @@ import os
 import json
 import hashlib
 import logging
+import tempfile
+import threading
+from contextlib import contextmanager
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory file locks
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
 
 class PositionCache:
-    """Cache for storing and retrieving successful field positions."""
+    """Cache for storing and retrieving successful field positions.
+    
+    The JSON file is shared by every process using the same cache_file: it
+    is replaced atomically on save and re-read whenever its modification
+    time changes, so entries written by one worker are seen by the others.
+    Within a process, the cache is shared by request threads, so reads and
+    writes of the in-memory dict and the file are serialized by a lock.
+    
+    Every change re-reads the file and saves it while holding an exclusive
+    flock on <cache_file>.lock, so concurrent writers in different processes
+    do not drop each other's entries. Where fcntl is unavailable (Windows)
+    only the in-process lock is taken, and concurrent writers in other
+    processes can lose entries.
+    """
     
     def __init__(self, cache_file: str = 'alignment_cache.json', ttl_hours: int = 24):
         """
@@ -26,12 +47,23 @@ class PositionCache:
             ttl_hours: Time-to-live for cache entries in hours (default: 24)
         """
         self.cache_file = cache_file
+        self.lock_file = cache_file + '.lock'
         self.ttl_hours = ttl_hours
+        self._file_mtime_ns = None
+        self._lock = threading.RLock()
         self.cache = self._load_cache()
     
+    def _stat_mtime_ns(self) -> Optional[int]:
+        try:
+            return os.stat(self.cache_file).st_mtime_ns
+        except OSError:
+            return None
+    
     def _load_cache(self) -> Dict[str, Any]:
         """Load cache from file."""
-        if not os.path.exists(self.cache_file):
+        mtime_ns = self._stat_mtime_ns()
+        self._file_mtime_ns = mtime_ns
+        if mtime_ns is None:
             return {}
         
         try:
@@ -43,11 +75,48 @@ class PositionCache:
             logger.warning(f"Could not load position cache: {e}")
             return {}
     
+    @contextmanager
+    def _write_lock(self):
+        """Hold the in-process lock and, where supported, the cache file lock."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            try:
+                lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError as e:
+                logger.warning(f"Could not open position cache lock file: {e}")
+                yield
+                return
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                # Closing the descriptor releases the flock
+                os.close(lock_fd)
+    
+    def _refresh(self):
+        """Reload the cache if another process has rewritten the file."""
+        if self._stat_mtime_ns() != self._file_mtime_ns:
+            self.cache = self._load_cache()
+    
     def _save_cache(self):
         """Save cache to file."""
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
+            # Write to a temp file and rename so other workers reading the
+            # cache never see a partially written file
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self.cache_file) or '.', suffix='.tmp'
+            )
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(self.cache, f, indent=2)
+                os.replace(tmp_path, self.cache_file)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._file_mtime_ns = self._stat_mtime_ns()
             logger.debug(f"Saved {len(self.cache)} entries to position cache")
         except Exception as e:
             logger.error(f"Could not save position cache: {e}")
@@ -83,24 +152,30 @@ class PositionCache:
         Returns:
             Cached position data or None if not found/expired
         """
-        key = self._generate_key(participant_data)
-        
-        if key not in self.cache:
-            logger.debug(f"Position cache miss for key {key[:8]}...")
-            return None
-        
-        entry = self.cache[key]
-        
-        # Check if entry is expired
-        cached_time = datetime.fromisoformat(entry['timestamp'])
-        if datetime.now() - cached_time > timedelta(hours=self.ttl_hours):
-            logger.debug(f"Position cache entry expired for key {key[:8]}...")
-            del self.cache[key]
-            self._save_cache()
-            return None
-        
-        logger.info(f"Position cache hit for key {key[:8]}... (age: {int((datetime.now() - cached_time).total_seconds())}s)")
-        return entry['data']
+        with self._lock:
+            key = self._generate_key(participant_data)
+            self._refresh()
+            
+            if key not in self.cache:
+                logger.debug(f"Position cache miss for key {key[:8]}...")
+                return None
+            
+            entry = self.cache[key]
+            
+            # Check if entry is expired
+            cached_time = datetime.fromisoformat(entry['timestamp'])
+            if datetime.now() - cached_time > timedelta(hours=self.ttl_hours):
+                logger.debug(f"Position cache entry expired for key {key[:8]}...")
+                with self._write_lock():
+                    # Only drop it if no other worker has re-cached it since
+                    self._refresh()
+                    if self.cache.get(key, {}).get('timestamp') == entry['timestamp']:
+                        del self.cache[key]
+                        self._save_cache()
+                return None
+            
+            logger.info(f"Position cache hit for key {key[:8]}... (age: {int((datetime.now() - cached_time).total_seconds())}s)")
+            return entry['data']
     
     def set(self, participant_data: Dict[str, str], position_data: Dict[str, Any]):
         """
@@ -110,57 +185,64 @@ class PositionCache:
             participant_data: Dictionary with name, event, organiser fields
             position_data: Position data to cache (field positions, font sizes, etc.)
         """
-        key = self._generate_key(participant_data)
-        
-        self.cache[key] = {
-            'timestamp': datetime.now().isoformat(),
-            'data': position_data
-        }
-        
-        self._save_cache()
-        logger.info(f"Cached position data for key {key[:8]}...")
+        with self._write_lock():
+            key = self._generate_key(participant_data)
+            self._refresh()
+            
+            self.cache[key] = {
+                'timestamp': datetime.now().isoformat(),
+                'data': position_data
+            }
+            
+            self._save_cache()
+            logger.info(f"Cached position data for key {key[:8]}...")
     
     def clear_expired(self):
         """Remove expired entries from cache."""
-        now = datetime.now()
-        expired_keys = []
-        
-        for key, entry in self.cache.items():
-            cached_time = datetime.fromisoformat(entry['timestamp'])
-            if now - cached_time > timedelta(hours=self.ttl_hours):
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            del self.cache[key]
-        
-        if expired_keys:
-            self._save_cache()
-            logger.info(f"Cleared {len(expired_keys)} expired cache entries")
+        with self._write_lock():
+            self._refresh()
+            now = datetime.now()
+            expired_keys = []
+            
+            for key, entry in self.cache.items():
+                cached_time = datetime.fromisoformat(entry['timestamp'])
+                if now - cached_time > timedelta(hours=self.ttl_hours):
+                    expired_keys.append(key)
+            
+            for key in expired_keys:
+                del self.cache[key]
+            
+            if expired_keys:
+                self._save_cache()
+                logger.info(f"Cleared {len(expired_keys)} expired cache entries")
     
     def clear_all(self):
         """Clear all cache entries."""
-        self.cache = {}
-        self._save_cache()
-        logger.info("Cleared all position cache entries")
+        with self._write_lock():
+            self.cache = {}
+            self._save_cache()
+            logger.info("Cleared all position cache entries")
     
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        total_entries = len(self.cache)
-        expired_count = 0
-        now = datetime.now()
-        
-        for entry in self.cache.values():
-            cached_time = datetime.fromisoformat(entry['timestamp'])
-            if now - cached_time > timedelta(hours=self.ttl_hours):
-                expired_count += 1
-        
-        return {
-            'total_entries': total_entries,
-            'active_entries': total_entries - expired_count,
-            'expired_entries': expired_count,
-            'cache_file': self.cache_file,
-            'ttl_hours': self.ttl_hours
-        }
+        with self._lock:
+            self._refresh()
+            total_entries = len(self.cache)
+            expired_count = 0
+            now = datetime.now()
+            
+            for entry in self.cache.values():
+                cached_time = datetime.fromisoformat(entry['timestamp'])
+                if now - cached_time > timedelta(hours=self.ttl_hours):
+                    expired_count += 1
+            
+            return {
+                'total_entries': total_entries,
+                'active_entries': total_entries - expired_count,
+                'expired_entries': expired_count,
+                'cache_file': self.cache_file,
+                'ttl_hours': self.ttl_hours
+            }
 
 
 # Global cache instance
@@ -24,6 +24,7 @@ class ProgressiveRefiner:
         """
         self.tolerance_px = tolerance_px
         self.adjustment_history = []
+        self.difference_history = []
     
     def calculate_adjustment(
         self,
@@ -170,6 +171,40 @@ class ProgressiveRefiner:
         
         return False
     
+    def record_difference(self, max_difference_px: float):
+        """
+        Record the maximum difference measured on an attempt.
+        
+        Args:
+            max_difference_px: Maximum field difference of the attempt in pixels
+        """
+        self.difference_history.append(max_difference_px)
+    
+    def is_stalled(self, patience: int = 3, min_progress_px: float = 1e-4) -> bool:
+        """
+        Check if the measured difference has stopped improving.
+        
+        Args:
+            patience: Consecutive attempts without progress before stalling
+            min_progress_px: Smallest decrease in max difference that counts
+                as progress
+            
+        Returns:
+            True if the last `patience` attempts each improved by less than
+            min_progress_px, False otherwise
+        """
+        if len(self.difference_history) <= patience:
+            return False
+        
+        recent = self.difference_history[-(patience + 1):]
+        if all(prev - curr < min_progress_px for prev, curr in zip(recent, recent[1:])):
+            logger.warning(
+                f"Progressive refinement stalled - no progress over {patience} attempts"
+            )
+            return True
+        
+        return False
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get refinement statistics.
@@ -3,11 +3,32 @@
 This module provides robust text alignment utilities that use PIL anchor points
 when available and fall back to metrics-based placement for precise vertical alignment.
 """
-from PIL import ImageFont
+from PIL import Image, ImageDraw, ImageFont
+from collections import OrderedDict
+from functools import lru_cache
+import math
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
+# PIL anchor points for each supported alignment mode
+_ANCHOR_MAP = {
+    "center": "mm",  # middle-middle
+    "right": "rm",   # right-middle
+    "left": "lm"     # left-middle
+}
+
+# Transparent border around text tiles, covers sub-pixel glyph overhang
+_TILE_PADDING = 2
+
+# LRU cache of rasterized text masks, keyed by font file, size, text and anchor.
+# Event and organiser strings repeat across a batch, so their glyphs are
+# rasterized once instead of once per certificate.
+_TILE_CACHE_SIZE = 256
+_tile_cache = OrderedDict()
+_tile_cache_lock = threading.Lock()
+
 
 def draw_text_centered(draw, position, text, font, fill, align="center", baseline_offset=0):
     """Draw text centered at the given position with optional baseline adjustment.
@@ -34,12 +55,7 @@ def draw_text_centered(draw, position, text, font, fill, align="center", baselin
     y_adjusted = y + baseline_offset
     
     # Map alignment to PIL anchor points
-    anchor_map = {
-        "center": "mm",  # middle-middle
-        "right": "rm",   # right-middle
-        "left": "lm"     # left-middle
-    }
-    anchor = anchor_map.get(align, "mm")
+    anchor = _ANCHOR_MAP.get(align, "mm")
     
     try:
         # Try using PIL anchor points (available in Pillow 8.0.0+)
@@ -51,6 +67,87 @@ def draw_text_centered(draw, position, text, font, fill, align="center", baselin
         return _draw_text_centered_fallback(draw, (x, y_adjusted), text, font, fill, align)
 
 
+def draw_text_tiled(image, position, text, font, fill, align="center", baseline_offset=0):
+    """Draw text by rasterizing it into a small tile and pasting the tile once.
+    
+    Glyphs are rendered into a sized-to-fit 'L' mask instead of directly into the
+    full certificate canvas, so rasterization stays inside a buffer of a few KB.
+    The mask is then blended onto the image with a single paste, and masks for
+    repeated strings are served from an LRU cache. The result is pixel-identical
+    to draw_text_centered for the same arguments.
+    
+    Args:
+        image: PIL Image to draw on
+        position: (x, y) tuple for text position
+        text: Text string to render
+        font: PIL ImageFont object
+        fill: Text color (RGB tuple or color name)
+        align: Alignment mode - "center", "right", or "left" (default: "center")
+        baseline_offset: Vertical offset in pixels to adjust baseline (default: 0)
+    
+    Returns:
+        Final drawn position (x, y) tuple
+    """
+    x, y = position
+    y_adjusted = y + baseline_offset
+    anchor = _ANCHOR_MAP.get(align, "mm")
+    
+    # Keep the sub-pixel part of the position inside the tile so glyph
+    # rasterization matches drawing at the original coordinates
+    ix, iy = math.floor(x), math.floor(y_adjusted)
+    
+    try:
+        tile, left, top = _get_text_tile(font, text, anchor, (x - ix, y_adjusted - iy))
+    except (TypeError, ValueError, AttributeError):
+        # Bitmap fonts without anchor support: draw directly on the canvas
+        return draw_text_centered(
+            ImageDraw.Draw(image), position, text, font, fill,
+            align=align, baseline_offset=baseline_offset
+        )
+    
+    image.paste(fill, (ix + left - _TILE_PADDING, iy + top - _TILE_PADDING), tile)
+    
+    return (x, y_adjusted)
+
+
+def _get_text_tile(font, text, anchor, subpixel):
+    """Return the 'L' mask for text, reusing a cached rasterization when possible.
+    
+    Only fonts loaded from a file path are cached; their path and size identify
+    the rasterization across separately loaded font objects.
+    
+    Returns:
+        Tuple of (tile, left, top) where left/top is the text bbox origin
+        relative to the anchor position
+    """
+    font_path = getattr(font, 'path', None)
+    key = None
+    if isinstance(font_path, str):
+        key = (font_path, font.size, getattr(font, 'index', 0), text, anchor, subpixel)
+        with _tile_cache_lock:
+            entry = _tile_cache.get(key)
+            if entry is not None:
+                _tile_cache.move_to_end(key)
+                return entry
+    
+    left, top, right, bottom = font.getbbox(text, anchor=anchor)
+    pad = _TILE_PADDING
+    tile = Image.new('L', (right - left + 2 * pad, bottom - top + 2 * pad), 0)
+    ImageDraw.Draw(tile).text(
+        (subpixel[0] + pad - left, subpixel[1] + pad - top),
+        text, font=font, fill=255, anchor=anchor
+    )
+    entry = (tile, left, top)
+    
+    if key is not None:
+        with _tile_cache_lock:
+            _tile_cache[key] = entry
+            if len(_tile_cache) > _TILE_CACHE_SIZE:
+                _tile_cache.popitem(last=False)
+    
+    return entry
+
+
 def _draw_text_centered_fallback(draw, position, text, font, fill, align="center"):
     """Fallback method for text centering using textbbox and font metrics.
     
@@ -101,9 +198,14 @@ def _draw_text_centered_fallback(draw, position, text, font, fill, align="center
     return (x_draw, y_draw)
 
 
+@lru_cache(maxsize=64)
 def get_font(font_path, size):
     """Load a TrueType font with fallback to default font.
     
+    Results are memoized per (font_path, size), so the font file is parsed
+    once per size instead of on every certificate; callers share the
+    returned font object and must not mutate it.
+    
     Args:
         font_path: Path to TrueType font file or None for default
         size: Font size in points
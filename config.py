@@ -33,6 +33,11 @@ class Config:
     
     # Certificate generation
     OUTPUT_FOLDER = os.getenv('OUTPUT_FOLDER', 'generated_certificates')
+    PNG_COMPRESS_LEVEL = int(os.getenv('PNG_COMPRESS_LEVEL', '1'))
+    # Render cache (disabled when empty); least recently used certificates
+    # beyond RENDER_CACHE_MAX_ENTRIES are deleted after each store
+    RENDER_CACHE_FOLDER = os.getenv('RENDER_CACHE_FOLDER', '')
+    RENDER_CACHE_MAX_ENTRIES = int(os.getenv('RENDER_CACHE_MAX_ENTRIES', '1000'))
     
     # Alignment verification settings
     ENABLE_ALIGNMENT_CHECK = os.getenv('ENABLE_ALIGNMENT_CHECK', 'True').lower() == 'true'
@@ -47,6 +52,7 @@ class Config:
     
     # Email retry settings
     EMAIL_MAX_RETRIES = int(os.getenv('EMAIL_MAX_RETRIES', '3'))
+    EMAIL_MAX_WORKERS = int(os.getenv('EMAIL_MAX_WORKERS', '8'))
     
     # Field position verification settings
     FIELD_POSITION_TOLERANCE_PX = int(os.getenv('FIELD_POSITION_TOLERANCE_PX', '2'))
@@ -5,17 +5,24 @@ to ensure text is properly positioned and validation works correctly.
 """
 import os
 import sys
+import json
 import tempfile
 import pytest
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from PIL import Image, ImageDraw
-from app.utils.text_align import draw_text_centered, get_font
-from app.utils.goonj_renderer import GOONJRenderer
-from app.utils.certificate_validator import validate
+from PIL import Image, ImageDraw, ImageChops
+from app.utils.text_align import draw_text_centered, draw_text_tiled, get_font
+from app.utils import certificate_validator
+from app.utils.goonj_renderer import GOONJRenderer, POSITIONS_SUFFIX
+from app.utils.certificate_validator import validate, validate_batch, validate_many
+from app.utils.enhanced_alignment_verifier import verify_alignment_enhanced_batch
+from app.utils.iterative_alignment_verifier import calculate_position_difference, extract_field_positions
+from app.utils.alignment_stats import AlignmentStats
+from app.utils.position_cache import PositionCache
 
 
 class TestTextAlignment:
@@ -70,6 +77,52 @@ class TestTextAlignment:
         pixels = list(img.getdata())
         has_text = any(pixel != (255, 255, 255) for pixel in pixels)
         assert has_text
+    
+    def test_get_font_is_cached(self):
+        """Test that fonts are loaded once per path and size."""
+        font_path = 'templates/ARIALBD.TTF'
+        
+        if not os.path.exists(font_path):
+            pytest.skip("Bundled font not found")
+        
+        assert get_font(font_path, 40) is get_font(font_path, 40)
+        assert get_font(font_path, 40) is not get_font(font_path, 41)
+    
+    def test_draw_text_tiled_matches_direct_draw(self):
+        """Test that tiled rendering produces the same pixels as direct drawing."""
+        font = get_font(None, 20)
+        
+        for align, position in [('center', (200, 150)), ('left', (50, 100)), ('right', (350.5, 200.5))]:
+            direct = Image.new('RGB', (400, 300), 'white')
+            tiled = direct.copy()
+            
+            draw_text_centered(ImageDraw.Draw(direct), position, "Tiled Text", font, 'black',
+                               align=align, baseline_offset=3)
+            draw_text_tiled(tiled, position, "Tiled Text", font, 'black',
+                            align=align, baseline_offset=3)
+            
+            assert ImageChops.difference(direct, tiled).getbbox() is None, \
+                f"Tiled rendering differs from direct drawing for align={align}"
+    
+    def test_draw_text_tiled_reuses_cached_tile(self):
+        """Test that repeated text from the same font file is rasterized once."""
+        from app.utils import text_align
+        
+        font_path = os.path.join(Path(__file__).parent.parent, 'templates', 'ARIALBD.TTF')
+        if not os.path.exists(font_path):
+            pytest.skip("Bundled font not found")
+        
+        first = Image.new('RGB', (400, 300), 'white')
+        second = first.copy()
+        
+        draw_text_tiled(first, (200, 150), "Cached Text", get_font(font_path, 24), 'black')
+        cached = [key for key in text_align._tile_cache if key[3] == "Cached Text"]
+        assert len(cached) == 1
+        
+        # A separately loaded font object must hit the same cache entry
+        draw_text_tiled(second, (200, 150), "Cached Text", get_font(font_path, 24), 'black')
+        assert [key for key in text_align._tile_cache if key[3] == "Cached Text"] == cached
+        assert ImageChops.difference(first, second).getbbox() is None
 
 
 class TestGOONJRenderer:
@@ -115,6 +168,220 @@ class TestGOONJRenderer:
             # Verify it's a valid image
             img = Image.open(cert_path)
             assert img.size == (renderer.width, renderer.height)
+    
+    def test_safe_filename_part(self):
+        """Test participant name sanitization for filenames."""
+        from app.utils.goonj_renderer import _safe_filename_part
+        
+        assert _safe_filename_part('John Doe') == 'John_Doe'
+        assert _safe_filename_part('a/b\\c..d-e_f') == 'a_b_c__d-e_f'
+        # Non-ASCII letters are kept, like the ASCII ones
+        assert _safe_filename_part('Zoë Ångström!') == 'Zoë_Ångström_'
+    
+    def test_load_template_uses_raw_cache(self):
+        """Test the raw template sidecar is reused and rebuilt when stale."""
+        from app.utils.goonj_renderer import _load_template, _template_cache
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            template_path = os.path.join(tmpdir, 'template.png')
+            Image.new('RGB', (40, 20), (10, 20, 30)).save(template_path)
+            
+            first = _load_template(template_path)
+            assert os.path.exists(template_path + '.raw.rgb')
+            assert os.path.exists(template_path + '.raw.meta')
+            
+            # Same process: the decoded image is shared
+            assert _load_template(template_path) is first
+            
+            # Fresh process: served from the raw sidecar
+            _template_cache.clear()
+            cached = _load_template(template_path)
+            assert cached is not first
+            assert cached.mode == 'RGB' and cached.size == (40, 20)
+            assert ImageChops.difference(first, cached).getbbox() is None
+            
+            # Changing the template invalidates the sidecar
+            Image.new('RGB', (30, 10), (200, 0, 0)).save(template_path)
+            os.utime(template_path, ns=(0, 0))
+            rebuilt = _load_template(template_path)
+            assert rebuilt.size == (30, 10)
+            assert rebuilt.getpixel((0, 0)) == (200, 0, 0)
+    
+    def test_render_lossy_formats(self):
+        """Test rendering JPEG and WebP certificates."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            renderer = GOONJRenderer(template_path, output_folder=tmpdir)
+            
+            for output_format, pil_format in [('jpg', 'JPEG'), ('webp', 'WEBP')]:
+                cert_path = renderer.render({'name': 'Lossy Test'}, output_format=output_format)
+                
+                assert cert_path.endswith(f'.{output_format}')
+                img = Image.open(cert_path)
+                assert img.format == pil_format
+                assert img.size == (renderer.width, renderer.height)
+    
+    def test_render_batch_matches_render(self):
+        """Test that batch rendering on a reused canvas matches single renders."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        participants = [
+            {'name': 'First Person', 'event': 'Batch Event', 'organiser': 'Batch Org'},
+            {'name': 'Second', 'event': 'Batch Event', 'organiser': 'Batch Org'},
+        ]
+        
+        with tempfile.TemporaryDirectory() as single_dir, tempfile.TemporaryDirectory() as batch_dir:
+            single_paths = [
+                GOONJRenderer(template_path, output_folder=single_dir).render(p)
+                for p in participants
+            ]
+            batch_paths = GOONJRenderer(template_path, output_folder=batch_dir).render_batch(participants)
+            
+            assert len(batch_paths) == len(participants)
+            for single_path, batch_path in zip(single_paths, batch_paths):
+                single_img = Image.open(single_path).convert('RGB')
+                batch_img = Image.open(batch_path).convert('RGB')
+                assert ImageChops.difference(single_img, batch_img).getbbox() is None, \
+                    "Canvas reuse must not leak text from the previous certificate"
+    
+    def test_render_batch_keeps_duplicate_names_apart(self):
+        """Test that participants with the same name get separate batch files."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        participants = [
+            {'name': 'John Smith', 'event': 'Event A'},
+            {'name': 'John Smith', 'event': 'Event B'},
+            {'name': 'John/Smith', 'event': 'Event C'},
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            renderer = GOONJRenderer(template_path, output_folder=tmpdir)
+            for kwargs in ({}, {'threads': 2}):
+                paths = renderer.render_batch(participants, **kwargs)
+                
+                assert len(set(paths)) == len(participants)
+                images = [Image.open(path).convert('RGB') for path in paths]
+                assert ImageChops.difference(images[0], images[1]).getbbox() is not None
+    
+    def test_render_cache_reuses_identical_certificates(self):
+        """Test that repeat renders are copied from the render cache."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_dir = os.path.join(tmpdir, 'cache')
+            renderer = GOONJRenderer(
+                template_path, output_folder=os.path.join(tmpdir, 'a'), cache_dir=cache_dir
+            )
+            first = renderer.render({'name': 'Cached Person', 'email': 'a@example.com'})
+            assert len(os.listdir(cache_dir)) == 1
+            
+            # Email is not drawn, so it does not affect the cache key
+            other = GOONJRenderer(
+                template_path, output_folder=os.path.join(tmpdir, 'b'), cache_dir=cache_dir
+            )
+            second = other.render({'name': 'Cached Person', 'email': 'b@example.com'})
+            cache_entry = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+            assert not os.path.samefile(cache_entry, second)
+            assert not os.path.samefile(cache_entry, first)
+            with open(first, 'rb') as f1, open(second, 'rb') as f2:
+                assert f1.read() == f2.read()
+            
+            other.render({'name': 'Someone Else'})
+            assert len(os.listdir(cache_dir)) == 2
+    
+    def test_render_cache_entries_survive_output_overwrite(self):
+        """Test that re-rendering onto an output path leaves cache entries intact."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_dir = os.path.join(tmpdir, 'cache')
+            renderer = GOONJRenderer(template_path, output_folder=tmpdir, cache_dir=cache_dir)
+            shared_path = os.path.join(tmpdir, 'shared.png')
+            renderer._output_path = lambda *args, **kwargs: shared_path
+            
+            renderer.render({'name': 'John Smith', 'event': 'Event A'})
+            with open(shared_path, 'rb') as f:
+                first_bytes = f.read()
+            renderer.render({'name': 'John Smith', 'event': 'Event B'})
+            with open(shared_path, 'rb') as f:
+                second_bytes = f.read()
+            
+            assert first_bytes != second_bytes
+            entries = []
+            for entry in os.listdir(cache_dir):
+                with open(os.path.join(cache_dir, entry), 'rb') as f:
+                    entries.append(f.read())
+            assert sorted(entries) == sorted([first_bytes, second_bytes])
+    
+    def test_render_cache_evicts_least_recently_used(self):
+        """Test that the render cache keeps at most cache_max_entries certificates."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_dir = os.path.join(tmpdir, 'cache')
+            renderer = GOONJRenderer(
+                template_path, output_folder=tmpdir, cache_dir=cache_dir, cache_max_entries=2
+            )
+            
+            def entry_for(name):
+                return renderer._cache_path({'name': name}, 'png')
+            
+            renderer.render({'name': 'First'})
+            renderer.render({'name': 'Second'})
+            # Age both entries, then hit 'First' so 'Second' is least recently used
+            for age, name in enumerate(('First', 'Second'), 1):
+                os.utime(entry_for(name), (1000 * age, 1000 * age))
+            renderer.render({'name': 'First'})
+            renderer.render({'name': 'Third'})
+            
+            assert sorted(os.listdir(cache_dir)) == sorted(
+                os.path.basename(entry_for(name)) for name in ('First', 'Third')
+            )
+    
+    def test_render_batch_parallel_matches_sequential(self):
+        """Test that worker processes and threads produce the same files in order."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        participants = [
+            {'name': f'Person {i}', 'event': 'Batch Event', 'organiser': 'Batch Org'}
+            for i in range(3)
+        ]
+        
+        with tempfile.TemporaryDirectory() as seq_dir, tempfile.TemporaryDirectory() as par_dir:
+            seq_paths = GOONJRenderer(template_path, output_folder=seq_dir).render_batch(participants)
+            renderer = GOONJRenderer(template_path, output_folder=par_dir)
+            
+            for kwargs in ({'jobs': 2}, {'threads': 2}):
+                par_paths = renderer.render_batch(participants, **kwargs)
+                
+                assert len(par_paths) == len(participants)
+                for i, (seq_path, par_path) in enumerate(zip(seq_paths, par_paths)):
+                    assert f'Person_{i}' in os.path.basename(par_path)
+                    seq_img = Image.open(seq_path).convert('RGB')
+                    par_img = Image.open(par_path).convert('RGB')
+                    assert ImageChops.difference(seq_img, par_img).getbbox() is None
 
 
 class TestCertificateValidator:
@@ -182,15 +449,224 @@ class TestCertificateValidator:
             cert_path = renderer.render(test_data)
             
             # Validate it
-            result = validate(cert_path, template_ref_path=template_path, tolerance_px=3)
+            result = validate(cert_path, template_ref_path=template_path, tolerance_px=3,
+                              generate_overlay='always')
             
             # Check overlay exists
             assert os.path.exists(result['overlay_path'])
-            assert result['overlay_path'].endswith('_validation_overlay.png')
+            assert result['overlay_path'].endswith('_validation_overlay.webp')
             
             # Verify it's a valid image
             overlay_img = Image.open(result['overlay_path'])
             assert overlay_img.size == Image.open(cert_path).size
+            
+            # PNG remains available for lossless inspection
+            result = validate(cert_path, template_ref_path=template_path, tolerance_px=3,
+                              generate_overlay='always', overlay_format='png')
+            assert result['overlay_path'].endswith('_validation_overlay.png')
+            assert Image.open(result['overlay_path']).format == 'PNG'
+    
+    def test_validate_overlay_modes(self):
+        """Test that overlays are skipped on request and for passing certificates."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            renderer = GOONJRenderer(template_path, output_folder=tmpdir, write_positions=True)
+            cert_path = renderer.render({'name': 'Mode Test', 'event': 'Test', 'organiser': 'Org'})
+            
+            result = validate(cert_path, generate_overlay='never')
+            assert result['overlay_path'] is None
+            
+            # Expect exactly what was drawn, so every field passes
+            with open(cert_path + POSITIONS_SUFFIX) as f:
+                drawn = json.load(f)
+            result = validate(cert_path, expected_positions=drawn, generate_overlay='on_fail')
+            assert result['pass']
+            assert result['overlay_path'] is None
+            
+            with pytest.raises(ValueError):
+                validate(cert_path, generate_overlay='sometimes')
+    
+    def test_validate_batch_matches_validate(self):
+        """Test that batch validation returns one validate()-style result per certificate."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            renderer = GOONJRenderer(template_path, output_folder=tmpdir)
+            cert_paths = [
+                renderer.render({'name': name, 'event': 'Test Event', 'organiser': 'Test Org'})
+                for name in ('Batch One', 'Batch Two')
+            ]
+            
+            results = validate_batch(cert_paths, template_ref_path=template_path, tolerance_px=3)
+            
+            assert len(results) == len(cert_paths)
+            for cert_path, result in zip(cert_paths, results):
+                single = validate(cert_path, template_ref_path=template_path, tolerance_px=3)
+                assert result['details'].keys() == single['details'].keys()
+                assert result['tolerance_px'] == 3
+                assert result['overlay_path'] == single['overlay_path']
+    
+    def test_validate_many_matches_validate_batch(self):
+        """Test that validating across worker processes gives the batch results in order."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            renderer = GOONJRenderer(template_path, output_folder=tmpdir)
+            cert_paths = [
+                renderer.render({'name': name, 'event': 'Test Event', 'organiser': 'Test Org'})
+                for name in ('Pool One', 'Pool Two', 'Pool Three')
+            ]
+            
+            batch = validate_batch(cert_paths, template_ref_path=template_path, tolerance_px=3)
+            pooled = validate_many(cert_paths, template_ref_path=template_path, tolerance_px=3,
+                                   workers=2, chunk_size=2)
+            
+            assert [r['details'] for r in pooled] == [r['details'] for r in batch]
+            assert [r['overlay_path'] for r in pooled] == [r['overlay_path'] for r in batch]
+    
+    def test_validate_uses_drawn_positions(self, monkeypatch):
+        """Test that positions recorded by the renderer replace OCR."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        def no_ocr(*args, **kwargs):
+            raise AssertionError("OCR should not run when drawn positions exist")
+        
+        monkeypatch.setattr(certificate_validator, '_detect_text_positions', no_ocr)
+        monkeypatch.setattr(certificate_validator, '_ocr_batch', no_ocr)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            renderer = GOONJRenderer(template_path, output_folder=tmpdir, write_positions=True)
+            cert_path = renderer.render({'name': 'Drawn Test', 'event': 'Test', 'organiser': 'Org'})
+            assert os.path.exists(cert_path + POSITIONS_SUFFIX)
+            
+            result = validate(cert_path, template_ref_path=template_path, tolerance_px=3)
+            (batch_result,) = validate_batch([cert_path], template_ref_path=template_path, tolerance_px=3)
+            
+            # Single-word fields are drawn centred on the template
+            width = Image.open(cert_path).size[0]
+            assert result['details']['name']['gen_px'][0] == pytest.approx(width // 2, abs=1)
+            assert batch_result['details'] == result['details']
+
+
+class TestEnhancedAlignmentBatch:
+    """Tests for batch alignment verification."""
+    
+    def test_batch_matches_single_verification(self):
+        """Test that pooled batch verification matches per-certificate differences."""
+        template_path = 'templates/goonj_certificate.png'
+        
+        if not os.path.exists(template_path):
+            pytest.skip("GOONJ template not found")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            renderer = GOONJRenderer(template_path, output_folder=tmpdir)
+            specs = []
+            for name in ('Batch One', 'Batch Two', 'Batch Three'):
+                data = {'name': name, 'event': 'Test Event', 'organiser': 'Test Org'}
+                specs.append({'generated_cert_path': renderer.render(data), 'participant_data': data})
+            specs.append({'generated_cert_path': os.path.join(tmpdir, 'missing.png'),
+                          'participant_data': {'name': 'Missing'}})
+            
+            results = verify_alignment_enhanced_batch(
+                specs, template_path, tolerance_px=50,
+                enable_cache=False, enable_stats=False, workers=2, chunk_size=2
+            )
+            
+            assert len(results) == len(specs)
+            reference = extract_field_positions(template_path)
+            for spec, result in zip(specs[:3], results):
+                expected = calculate_position_difference(
+                    extract_field_positions(spec['generated_cert_path']), reference
+                )
+                assert result['fields'] == expected['fields']
+                assert result['passed'] == (expected['max_difference_px'] <= 50)
+            assert results[3]['passed'] is False
+            assert results[3]['max_difference_px'] == float('inf')
+
+
+class TestAlignmentStats:
+    """Tests for the alignment statistics tracker."""
+    
+    def test_summary_while_writer_records(self):
+        """Test that summaries read while records arrive on the writer thread."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            stats = AlignmentStats(os.path.join(tmpdir, 'stats.json'))
+            
+            # New histogram and field keys on every record grow the dicts
+            # that get_summary iterates
+            for i in range(200):
+                stats.record_verification_async(
+                    passed=i % 2 == 0, attempts=i, max_difference_px=1.0,
+                    field_differences={f'field{i}': {'error': 'not found'}}, tolerance_px=0.5
+                )
+                summary = stats.get_summary()
+                snapshot = stats.snapshot()
+                assert summary['total_verifications'] == snapshot['total_verifications']
+            stats.flush()
+            
+            summary = stats.get_summary()
+            assert summary['total_verifications'] == 200
+            assert summary['successful_verifications'] == 100
+            assert len(summary['attempts_distribution']) == 200
+            with open(stats.stats_file) as f:
+                assert json.load(f)['total_verifications'] == 200
+            
+            # A snapshot is not changed by later records
+            snapshot = stats.snapshot()
+            stats.record_verification(
+                passed=True, attempts=1, max_difference_px=0.0,
+                field_differences={'late': {'error': 'not found'}}, tolerance_px=0.5
+            )
+            assert 'late' not in snapshot['field_failures']
+            assert len(snapshot['records']) == 100
+
+
+def _cache_positions(cache_file, worker, count):
+    """Write count entries to a shared position cache (runs in a worker process)."""
+    cache = PositionCache(cache_file)
+    for i in range(count):
+        cache.set({'name': f'worker{worker}-{i}'}, {'attempt': i})
+
+
+class TestPositionCache:
+    """Tests for the shared position cache file."""
+    
+    def test_concurrent_processes_keep_every_entry(self):
+        """Test that writers in several processes do not drop each other's entries."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_file = os.path.join(tmpdir, 'alignment_cache.json')
+            with ProcessPoolExecutor(max_workers=3) as executor:
+                for future in [executor.submit(_cache_positions, cache_file, w, 20) for w in range(3)]:
+                    future.result()
+            
+            cache = PositionCache(cache_file)
+            assert cache.stats()['total_entries'] == 60
+            assert cache.get({'name': 'worker2-19'}) == {'attempt': 19}
+    
+    def test_stats_and_clear_expired_see_other_writers(self):
+        """Test that stats and clear_expired re-read entries saved by another instance."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_file = os.path.join(tmpdir, 'alignment_cache.json')
+            reader = PositionCache(cache_file, ttl_hours=0)
+            writer = PositionCache(cache_file, ttl_hours=0)
+            writer.set({'name': 'Expired'}, {'attempt': 1})
+            
+            assert reader.stats()['expired_entries'] == 1
+            reader.clear_expired()
+            assert PositionCache(cache_file).stats()['total_entries'] == 0
 
 
 def test_smoke_alignment():
@@ -0,0 +1,138 @@
+"""
+Tests for bulk certificate email sending.
+
+mail.connect() is replaced with fake sessions so the tests exercise share
+ordering, retries and reconnects without an SMTP server.
+"""
+import sys
+import smtplib
+import threading
+import pytest
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask import Flask
+from app.utils import email_sender
+from app.utils.email_sender import mail, send_certificate_emails_bulk
+
+
+class FakeConnection:
+    """Stands in for the Flask-Mail connection returned by mail.connect()."""
+
+    def __init__(self, log, failures):
+        self.log = log
+        self.failures = failures
+        self.sent = []
+        self.closed = False
+
+    def __enter__(self):
+        with self.log['lock']:
+            self.log['connections'].append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.closed = True
+
+    def send(self, msg):
+        recipient = msg.recipients[0]
+        with self.log['lock']:
+            self.log['attempts'].append(recipient)
+            errors = self.failures.get(recipient)
+            error = errors.pop(0) if errors else None
+        if error is not None:
+            raise error
+        self.sent.append(recipient)
+
+
+@pytest.fixture
+def bulk_app(monkeypatch, tmp_path):
+    """Flask app with mail.connect() faked; returns (app, log, failures, items)."""
+    app = Flask(__name__)
+    app.config.update(MAIL_DEFAULT_SENDER='certs@example.com', EMAIL_MAX_RETRIES=3)
+    mail.init_app(app)
+
+    log = {'lock': threading.Lock(), 'connections': [], 'attempts': []}
+    failures = {}
+    monkeypatch.setattr(mail, 'connect', lambda: FakeConnection(log, failures))
+    monkeypatch.setattr(email_sender, 'retry_delay', lambda attempt: 0)
+
+    def no_fallback(msg):
+        raise AssertionError("sends should go over the shared session")
+    monkeypatch.setattr(mail, 'send', no_fallback)
+
+    cert_path = tmp_path / 'cert.png'
+    cert_path.write_bytes(b'png-bytes')
+    items = [
+        {
+            'recipient_email': f'person{i}@example.com',
+            'recipient_name': f'Person {i}',
+            'event_name': 'Test Event',
+            'certificate_path': str(cert_path),
+        }
+        for i in range(5)
+    ]
+    return app, log, failures, items
+
+
+class TestBulkCertificateEmails:
+    """Test send_certificate_emails_bulk."""
+
+    def test_shares_are_contiguous_and_results_ordered(self, bulk_app):
+        """Test that each worker sends a contiguous share over one session."""
+        app, log, failures, items = bulk_app
+
+        with app.app_context():
+            results = send_certificate_emails_bulk(items, max_workers=2)
+
+        assert results == [True] * len(items)
+        assert len(log['connections']) == 2
+        shares = sorted(conn.sent for conn in log['connections'])
+        assert shares == [
+            [item['recipient_email'] for item in items[:3]],
+            [item['recipient_email'] for item in items[3:]],
+        ]
+        assert all(conn.closed for conn in log['connections'])
+
+    def test_transient_error_is_retried_on_a_new_session(self, bulk_app):
+        """Test that a dropped session is reopened and the send retried."""
+        app, log, failures, items = bulk_app
+        failures['person1@example.com'] = [smtplib.SMTPServerDisconnected('dropped')]
+
+        with app.app_context():
+            results = send_certificate_emails_bulk(items, max_workers=1)
+
+        assert results == [True] * len(items)
+        assert log['attempts'].count('person1@example.com') == 2
+
+        # The failed session was closed and the rest of the share used a new one
+        first, second = log['connections']
+        assert first.closed and second.closed
+        assert first.sent == ['person0@example.com']
+        assert second.sent == [item['recipient_email'] for item in items[1:]]
+
+    def test_permanent_error_is_not_retried(self, bulk_app):
+        """Test that PERMANENT_SMTP_ERRORS fail the item without a retry."""
+        app, log, failures, items = bulk_app
+        failures['person2@example.com'] = [
+            smtplib.SMTPRecipientsRefused({'person2@example.com': (550, b'no such user')})
+        ]
+
+        with app.app_context():
+            results = send_certificate_emails_bulk(items, max_workers=1)
+
+        assert results == [True, True, False, True, True]
+        assert log['attempts'].count('person2@example.com') == 1
+        assert len(log['connections']) == 1
+
+    def test_retries_exhausted_reports_failure(self, bulk_app):
+        """Test that an item failing every attempt is reported as not sent."""
+        app, log, failures, items = bulk_app
+        failures['person0@example.com'] = [smtplib.SMTPServerDisconnected('dropped')] * 3
+
+        with app.app_context():
+            results = send_certificate_emails_bulk(items[:2], max_workers=1)
+
+        assert results == [False, True]
+        assert log['attempts'].count('person0@example.com') == 3
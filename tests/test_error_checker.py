@@ -0,0 +1,191 @@
+"""
+Tests for the diagnostics in app.utils.error_checker.
+
+Events live in an in-memory SQLite database and templates in a temporary
+uploads folder, and smtplib.SMTP is faked, so the checks run without the
+full application or a mail server.
+"""
+import os
+import sys
+import smtplib
+import pytest
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask import Flask
+from app.models.sqlite_models import Event, db
+from app.utils import error_checker
+from app.utils.error_checker import check_smtp, check_uploads_and_templates
+
+
+@pytest.fixture
+def checker_app(tmp_path, monkeypatch):
+    """Flask app on an in-memory database with a temporary uploads folder."""
+    monkeypatch.chdir(tmp_path)
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI='sqlite:///:memory:',
+        UPLOAD_FOLDER='uploads',
+    )
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _write(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'template')
+
+
+class TestCheckUploadsAndTemplates:
+    """Test check_uploads_and_templates."""
+    
+    def test_statuses_and_single_commit(self, checker_app, monkeypatch):
+        """Test each status and that all fixes are saved in one commit."""
+        _write('uploads/ok.png')
+        # The same basename twice: the top-level copy comes first in walk order
+        _write('uploads/moved.png')
+        _write('uploads/nested/moved.png')
+        _write('uploads/nested/deeper/other.png')
+        
+        events = [
+            Event(name='Missing', template_path=''),
+            Event(name='Ok', template_path='uploads/ok.png'),
+            Event(name='Moved', template_path='old/place/moved.png'),
+            Event(name='Moved deeper', template_path='old/other.png'),
+            Event(name='Gone', template_path='uploads/gone.png'),
+        ]
+        db.session.add_all(events)
+        db.session.commit()
+        ids = [event.id for event in events]
+        
+        commits = []
+        real_commit = db.session.commit
+        monkeypatch.setattr(db.session, 'commit', lambda: commits.append(1) or real_commit())
+        
+        report = check_uploads_and_templates(checker_app)
+        
+        statuses = {r['event']: r['status'] for r in report['results']}
+        assert statuses == {
+            ids[0]: 'missing',
+            ids[1]: 'ok',
+            ids[2]: 'fixed',
+            ids[3]: 'fixed',
+            ids[4]: 'missing_file',
+        }
+        assert report['ok'] is False
+        assert [fix['new'] for fix in report['fixes']] == [
+            'uploads/moved.png', 'uploads/nested/deeper/other.png'
+        ]
+        assert len(commits) == 1
+        
+        db.session.expire_all()
+        paths = {event.id: event.template_path for event in Event.query.all()}
+        assert paths[ids[2]] == 'uploads/moved.png'
+        assert paths[ids[3]] == 'uploads/nested/deeper/other.png'
+        assert paths[ids[4]] == 'uploads/gone.png'
+    
+    def test_no_auto_fix_leaves_database_unchanged(self, checker_app, monkeypatch):
+        """Test that auto_fix=False reports fixes without committing them."""
+        _write('uploads/nested/moved.png')
+        db.session.add(Event(name='Moved', template_path='old/moved.png'))
+        db.session.commit()
+        
+        commits = []
+        monkeypatch.setattr(db.session, 'commit', lambda: commits.append(1))
+        
+        report = check_uploads_and_templates(checker_app, auto_fix=False)
+        
+        assert [r['status'] for r in report['results']] == ['fixed']
+        assert report['fixes'] == []
+        assert commits == []
+        assert Event.query.one().template_path == 'old/moved.png'
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP and records every connection made."""
+    
+    instances = []
+    login_error = None
+    
+    def __init__(self, server, port, timeout=None):
+        self.noop_error = None
+        self.closed = False
+        self.logged_in = False
+        FakeSMTP.instances.append(self)
+    
+    def ehlo(self):
+        pass
+    
+    def starttls(self):
+        pass
+    
+    def login(self, username, password):
+        if FakeSMTP.login_error is not None:
+            raise FakeSMTP.login_error
+        self.logged_in = True
+    
+    def noop(self):
+        if self.noop_error is not None:
+            raise self.noop_error
+        return (250, b'OK')
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def smtp_app(monkeypatch):
+    """Flask app with mail credentials, smtplib.SMTP faked and an empty pool."""
+    FakeSMTP.instances = []
+    FakeSMTP.login_error = None
+    monkeypatch.setattr(smtplib, 'SMTP', FakeSMTP)
+    monkeypatch.setattr(error_checker, '_smtp_pool', {})
+    app = Flask(__name__)
+    app.config.update(
+        MAIL_SERVER='smtp.example.com', MAIL_PORT=587, MAIL_USE_TLS=True,
+        MAIL_USERNAME='user', MAIL_PASSWORD='secret',
+    )
+    return app
+
+
+class TestCheckSmtp:
+    """Test check_smtp and its connection pool."""
+    
+    def test_reuses_connection_after_noop(self, smtp_app):
+        """Test that a live pooled connection is re-checked with NOOP, not reopened."""
+        assert check_smtp(smtp_app)['ok'] is True
+        assert check_smtp(smtp_app)['ok'] is True
+        
+        assert len(FakeSMTP.instances) == 1
+        assert not FakeSMTP.instances[0].closed
+    
+    def test_reconnects_after_server_disconnect(self, smtp_app):
+        """Test that a dropped pooled connection is closed and replaced."""
+        assert check_smtp(smtp_app)['ok'] is True
+        first = FakeSMTP.instances[0]
+        first.noop_error = smtplib.SMTPServerDisconnected('dropped')
+        
+        assert check_smtp(smtp_app)['ok'] is True
+        
+        assert len(FakeSMTP.instances) == 2
+        assert first.closed
+        second = FakeSMTP.instances[1]
+        assert second.logged_in and not second.closed
+        assert list(error_checker._smtp_pool.values()) == [second]
+    
+    def test_failed_login_closes_connection(self, smtp_app):
+        """Test that a connection whose login fails is closed and not pooled."""
+        FakeSMTP.login_error = smtplib.SMTPAuthenticationError(535, b'bad credentials')
+        
+        result = check_smtp(smtp_app)
+        
+        assert result['ok'] is False
+        assert FakeSMTP.instances[0].closed
+        assert error_checker._smtp_pool == {}
@@ -0,0 +1,485 @@
+"""
+Tests for the certificate template scanner.
+
+Tesseract is not needed: subprocess.run and pytesseract are replaced with
+fakes that return canned OCR output, so the tests cover how the scanner
+batches, splits and maps OCR results rather than OCR accuracy.
+"""
+import io
+import os
+import sys
+import random
+import subprocess
+import pytest
+import numpy as np
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from PIL import Image
+from app.utils import certificate_scanner
+from app.utils.certificate_scanner import (
+    CertificateScanner, DetectedField, SmartCertificateAligner, TemplateAnalysis
+)
+
+TSV_HEADER = ['level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+              'left', 'top', 'width', 'height', 'conf', 'text']
+
+
+def _tsv(rows):
+    """Build Tesseract TSV output from (level, page_num, left, top, width, height, conf, text) rows."""
+    lines = ['\t'.join(TSV_HEADER)]
+    for level, page_num, left, top, width, height, conf, text in rows:
+        lines.append('\t'.join(str(v) for v in (
+            level, page_num, 1, 1, 1, 1, left, top, width, height, conf, text
+        )))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _page_row(page_num, size):
+    """The level-1 row Tesseract emits for every page, words or not."""
+    return (1, page_num, 0, 0, size[0], size[1], -1, '')
+
+
+def _write_image(path, size, color='white'):
+    Image.new('RGB', size, color).save(path)
+    return str(path)
+
+
+class FakeRun:
+    """Stands in for subprocess.run, answering with canned TSV output."""
+    
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.calls = []
+        self.page_lists = []
+    
+    def __call__(self, args, **kwargs):
+        self.calls.append(args)
+        with open(args[1]) as f:
+            self.page_lists.append(f.read().splitlines())
+        return subprocess.CompletedProcess(args, 0, stdout=self.stdout, stderr=b'')
+
+
+@pytest.fixture
+def scanner():
+    """Scanner at 300 DPI that OCRs at full resolution."""
+    return CertificateScanner(dpi=300, ocr_dpi=None)
+
+
+class TestOcrBatch:
+    """Test the single Tesseract run in scan_certificates."""
+    
+    def test_tsv_is_split_by_page_num(self, scanner, tmp_path, monkeypatch):
+        """Test that rows go to their page and a page without words stays empty."""
+        sizes = [(400, 300), (500, 300), (600, 300)]
+        images = [Image.new('RGB', size, 'white') for size in sizes]
+        paths = [str(tmp_path / f'cert{i}.png') for i in range(3)]
+        fake_run = FakeRun(_tsv([
+            _page_row(1, sizes[0]),
+            (5, 1, 10, 20, 60, 30, 96, 'Alice'),
+            (5, 1, 80, 20, 70, 30, 91, 'Smith'),
+            _page_row(2, sizes[1]),
+            _page_row(3, sizes[2]),
+            (5, 3, 30, 40, 50, 25, 88, 'Carol'),
+        ]))
+        monkeypatch.setattr(certificate_scanner.subprocess, 'run', fake_run)
+        
+        pages = scanner._ocr_batch(images, paths)
+        
+        assert len(fake_run.calls) == 1
+        assert len(fake_run.page_lists[0]) == 3
+        assert [page['text'] for page in pages] == [['', 'Alice', 'Smith'], [''], ['', 'Carol']]
+        assert pages[0]['left'] == [0, 10, 80]
+        assert pages[2]['conf'] == [-1, 88]
+        assert all(set(page) == set(TSV_HEADER) for page in pages)
+    
+    def test_pages_missing_from_output_are_empty(self, scanner, tmp_path, monkeypatch):
+        """Test that a page with no TSV rows at all gets empty columns."""
+        images = [Image.new('RGB', (400, 300), 'white') for _ in range(2)]
+        paths = [str(tmp_path / f'cert{i}.png') for i in range(2)]
+        monkeypatch.setattr(certificate_scanner.subprocess, 'run', FakeRun(_tsv([
+            _page_row(2, (400, 300)),
+            (5, 2, 10, 20, 60, 30, 96, 'Bob'),
+        ])))
+        
+        pages = scanner._ocr_batch(images, paths)
+        
+        assert all(values == [] for values in pages[0].values())
+        assert pages[1]['text'] == ['', 'Bob']
+    
+    def test_scan_certificates_keeps_input_order(self, scanner, tmp_path, monkeypatch):
+        """Test that analyses come back in the order of the input paths."""
+        sizes = [(400, 300), (500, 320), (600, 340)]
+        paths = [_write_image(tmp_path / f'cert{i}.png', size) for i, size in enumerate(sizes)]
+        fake_run = FakeRun(_tsv([
+            _page_row(1, sizes[0]),
+            (5, 1, 170, 135, 60, 30, 96, 'Alice'),
+            _page_row(2, sizes[1]),
+            _page_row(3, sizes[2]),
+            (5, 3, 270, 155, 60, 30, 88, 'Carol'),
+        ]))
+        monkeypatch.setattr(certificate_scanner.subprocess, 'run', fake_run)
+        
+        analyses = scanner.scan_certificates(paths)
+        
+        # Images already on disk at OCR resolution are passed by path
+        assert fake_run.page_lists[0] == [os.path.abspath(path) for path in paths]
+        assert [(a.width, a.height) for a in analyses] == sizes
+        assert [[f.text for f in a.detected_fields] for a in analyses] == [['Alice'], [], ['Carol']]
+    
+    def test_scan_certificates_falls_back_when_batch_fails(self, scanner, tmp_path, monkeypatch):
+        """Test that a failed batch run scans each certificate separately."""
+        paths = [_write_image(tmp_path / f'cert{i}.png', (400, 300)) for i in range(2)]
+        
+        def failing_run(args, **kwargs):
+            raise subprocess.CalledProcessError(1, args)
+        
+        single_runs = []
+        
+        def image_to_data(image, **kwargs):
+            single_runs.append(image.size)
+            return {key: [] for key in TSV_HEADER}
+        
+        monkeypatch.setattr(certificate_scanner.subprocess, 'run', failing_run)
+        monkeypatch.setattr(certificate_scanner.pytesseract, 'image_to_data', image_to_data)
+        
+        analyses = scanner.scan_certificates(paths)
+        
+        assert len(analyses) == 2
+        assert single_runs == [(400, 300), (400, 300)]
+
+
+def _ocr_by_filename(args, **kwargs):
+    """Fake Tesseract batch run: one centred word per page, named after its file."""
+    with open(args[1]) as f:
+        page_paths = f.read().splitlines()
+    rows = []
+    for page_num, page_path in enumerate(page_paths, 1):
+        with Image.open(page_path) as image:
+            width, height = image.size
+        rows.append(_page_row(page_num, (width, height)))
+        rows.append((5, page_num, width // 2 - 30, height // 2 - 15, 60, 30, 95, Path(page_path).stem))
+    return subprocess.CompletedProcess(args, 0, stdout=_tsv(rows), stderr=b'')
+
+
+def _without_timestamp(analysis):
+    data = analysis.to_dict()
+    del data['scan_timestamp']
+    return data
+
+
+class TestScanMany:
+    """Test scan_many across worker processes."""
+    
+    def test_workers_match_scan_certificates_in_order(self, scanner, tmp_path, monkeypatch):
+        """Test that pooled scans equal a single-process scan, in input order."""
+        paths = [
+            _write_image(tmp_path / f'cert{i}.png', (400 + 20 * i, 300))
+            for i in range(5)
+        ]
+        # Worker processes are forked, so they inherit the fake
+        monkeypatch.setattr(certificate_scanner.subprocess, 'run', _ocr_by_filename)
+        
+        pooled = scanner.scan_many(paths, workers=2, chunk_size=2)
+        expected = scanner.scan_certificates(paths)
+        
+        assert [[f.text for f in a.detected_fields] for a in pooled] == [
+            [f'cert{i}'] for i in range(5)
+        ]
+        assert [_without_timestamp(a) for a in pooled] == [_without_timestamp(a) for a in expected]
+    
+    def test_single_worker_and_empty_input(self, scanner, tmp_path, monkeypatch):
+        """Test that one worker scans in-process and no paths give no results."""
+        paths = [_write_image(tmp_path / 'cert0.png', (400, 300))]
+        monkeypatch.setattr(certificate_scanner.subprocess, 'run', _ocr_by_filename)
+        
+        def no_pool(*args, **kwargs):
+            raise AssertionError("a single worker should not start a process pool")
+        monkeypatch.setattr(certificate_scanner, 'ProcessPoolExecutor', no_pool)
+        
+        assert [[f.text for f in a.detected_fields] for a in scanner.scan_many(paths, workers=4)] == [['cert0']]
+        assert scanner.scan_many([], workers=4) == []
+
+
+def _field(x, y, confidence, text=''):
+    return DetectedField(
+        text=text or f'{x:.3f},{y:.3f}', x=x, y=y, width=0.1, height=0.03, font_size=12,
+        color='#000000', alignment='center', confidence=confidence, field_type='static'
+    )
+
+
+def _pairwise_deduplicate(fields):
+    """The O(n^2) rule _deduplicate_fields replaced, kept as the reference."""
+    deduplicated = []
+    for field in fields:
+        is_duplicate = False
+        for existing in deduplicated:
+            if abs(field.x - existing.x) < 0.05 and abs(field.y - existing.y) < 0.05:
+                if field.confidence > existing.confidence:
+                    deduplicated.remove(existing)
+                else:
+                    is_duplicate = True
+                break
+        if not is_duplicate:
+            deduplicated.append(field)
+    return deduplicated
+
+
+class TestDeduplicateFields:
+    """Test that the grid deduplication keeps the pairwise rule's results."""
+    
+    def _assert_matches_pairwise(self, scanner, fields):
+        kept = scanner._deduplicate_fields(list(fields))
+        assert [id(f) for f in kept] == [id(f) for f in _pairwise_deduplicate(list(fields))]
+    
+    def test_overlapping_boxes(self, scanner):
+        """Test overlapping boxes: the higher-confidence box wins and moves to the end."""
+        fields = [
+            _field(0.50, 0.30, 0.6, 'low'),
+            _field(0.20, 0.70, 0.9, 'other'),
+            _field(0.52, 0.31, 0.8, 'high'),
+            _field(0.51, 0.29, 0.7, 'middle'),
+        ]
+        self._assert_matches_pairwise(scanner, fields)
+        assert [f.text for f in scanner._deduplicate_fields(fields)] == ['other', 'high']
+    
+    def test_adjacent_boxes(self, scanner):
+        """Test boxes just inside, exactly at and across the 0.05 distance and grid lines."""
+        fields = [
+            _field(0.10, 0.10, 0.5),
+            _field(0.149, 0.10, 0.6),   # just inside in x, next grid cell
+            _field(0.20, 0.10, 0.7),    # 0.051 from the previous box
+            _field(0.25, 0.149, 0.4),
+            _field(0.25, 0.199, 0.9),   # within 0.05 in y of the previous one
+            _field(0.049, 0.051, 0.8),  # either side of the first grid line
+            _field(0.051, 0.049, 0.3),
+        ]
+        self._assert_matches_pairwise(scanner, fields)
+    
+    def test_chained_duplicates(self, scanner):
+        """Test a chain where each box is close only to its neighbours."""
+        fields = [_field(0.30 + 0.03 * i, 0.50, 0.5 + 0.05 * (i % 3)) for i in range(8)]
+        self._assert_matches_pairwise(scanner, fields)
+    
+    def test_random_layouts(self, scanner):
+        """Test many random layouts on a 0.01 lattice, where distances hit the threshold."""
+        rng = random.Random(1234)
+        for _ in range(300):
+            fields = [
+                _field(rng.randint(0, 30) / 100, rng.randint(0, 30) / 100, rng.randint(1, 10) / 10)
+                for _ in range(rng.randint(1, 25))
+            ]
+            self._assert_matches_pairwise(scanner, fields)
+    
+    def test_empty(self, scanner):
+        """Test that no fields stay no fields."""
+        assert scanner._deduplicate_fields([]) == []
+
+
+class TestOcrResolution:
+    """Test OCR at ocr_dpi and the mapping of boxes back to full resolution."""
+    
+    def _fake_image_to_data(self, monkeypatch, box):
+        """Answer image_to_data with one word at box; returns the OCR'd image sizes."""
+        seen = []
+        
+        def image_to_data(image, **kwargs):
+            seen.append(image.size)
+            left, top, width, height = box
+            return {'text': ['Alice'], 'conf': [95], 'left': [left], 'top': [top],
+                    'width': [width], 'height': [height]}
+        monkeypatch.setattr(certificate_scanner.pytesseract, 'image_to_data', image_to_data)
+        return seen
+    
+    def test_boxes_scale_back_to_full_resolution(self, tmp_path, monkeypatch):
+        """Test that a box found at 150 DPI lands on full-resolution coordinates."""
+        path = _write_image(tmp_path / 'cert.png', (800, 600))
+        seen = self._fake_image_to_data(monkeypatch, (100, 50, 40, 20))
+        scanner = CertificateScanner(dpi=300, ocr_dpi=150)
+        
+        (field,) = scanner.scan_certificate(path).detected_fields
+        
+        assert seen == [(400, 300)]
+        # Full-resolution box: left 200, top 100, 80 x 40
+        assert field.x == pytest.approx((200 + 40) / 800)
+        assert field.y == pytest.approx((100 + 20) / 600)
+        assert field.width == pytest.approx(80 / 800)
+        assert field.height == pytest.approx(40 / 600)
+        assert field.font_size == 20
+    
+    def test_batch_pages_are_written_at_ocr_resolution(self, tmp_path, monkeypatch):
+        """Test that batch OCR pages are downscaled and their boxes scaled back."""
+        path = _write_image(tmp_path / 'cert.png', (800, 600))
+        page_sizes = []
+        
+        def run(args, **kwargs):
+            with open(args[1]) as f:
+                for page_path in f.read().splitlines():
+                    with Image.open(page_path) as image:
+                        page_sizes.append(image.size)
+            return subprocess.CompletedProcess(args, 0, stdout=_tsv([
+                _page_row(1, (400, 300)), (5, 1, 100, 50, 40, 20, 95, 'Alice'),
+            ]), stderr=b'')
+        monkeypatch.setattr(certificate_scanner.subprocess, 'run', run)
+        
+        (analysis,) = CertificateScanner(dpi=300, ocr_dpi=150).scan_certificates([path])
+        
+        assert page_sizes == [(400, 300)]
+        assert analysis.detected_fields[0].x == pytest.approx(0.3)
+        assert analysis.detected_fields[0].y == pytest.approx(0.2)
+    
+    def test_ocr_dpi_none_uses_full_resolution(self, tmp_path, monkeypatch):
+        """Test that ocr_dpi=None (or >= dpi) OCRs the image as is, without scaling boxes."""
+        path = _write_image(tmp_path / 'cert.png', (800, 600))
+        seen = self._fake_image_to_data(monkeypatch, (200, 100, 80, 40))
+        
+        for ocr_dpi in (None, 300, 600):
+            scanner = CertificateScanner(dpi=300, ocr_dpi=ocr_dpi)
+            assert scanner._ocr_size((800, 600)) == (800, 600)
+            (field,) = scanner.scan_certificate(path).detected_fields
+            assert field.x == pytest.approx(0.3)
+            assert field.width == pytest.approx(0.1)
+        
+        assert seen == [(800, 600)] * 3
+    
+    def test_ocr_size_never_reaches_zero(self):
+        """Test that tiny images keep at least one pixel per side at OCR resolution."""
+        scanner = CertificateScanner(dpi=300, ocr_dpi=150)
+        assert scanner._ocr_size((801, 1)) == (400, 1)
+
+
+def _ppm_bytes(size, color):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PPM')
+    return buffer.getvalue()
+
+
+class TestPdfToImage:
+    """Test PDF rasterizing with pdftoppm and the pdf2image fallback."""
+    
+    @pytest.fixture
+    def fallback(self, monkeypatch):
+        """Fake pdf2image.convert_from_path; returns the calls it received."""
+        calls = []
+        
+        def convert_from_path(pdf_path, **kwargs):
+            calls.append((pdf_path, kwargs))
+            return [Image.new('RGB', (30, 20), 'blue')]
+        monkeypatch.setattr(certificate_scanner, 'convert_from_path', convert_from_path)
+        return calls
+    
+    def test_pdftoppm_stdout_is_decoded(self, scanner, monkeypatch, fallback):
+        """Test that one pdftoppm -singlefile run is read from stdout."""
+        calls = []
+        
+        def run(args, **kwargs):
+            calls.append(args)
+            return subprocess.CompletedProcess(args, 0, stdout=_ppm_bytes((40, 25), 'red'), stderr=b'')
+        monkeypatch.setattr(certificate_scanner.subprocess, 'run', run)
+        
+        image = scanner._pdf_to_image('cert.pdf', page=2)
+        
+        assert calls == [['pdftoppm', '-r', '300', '-f', '3', '-l', '3', '-singlefile', 'cert.pdf']]
+        assert image.size == (40, 25)
+        assert image.getpixel((0, 0)) == (255, 0, 0)
+        assert fallback == []
+    
+    def test_missing_pdftoppm_falls_back_to_pdf2image(self, scanner, monkeypatch, fallback):
+        """Test that a missing pdftoppm binary falls back to convert_from_path."""
+        def run(args, **kwargs):
+            raise FileNotFoundError(2, 'No such file or directory', 'pdftoppm')
+        monkeypatch.setattr(certificate_scanner.subprocess, 'run', run)
+        
+        image = scanner._pdf_to_image('cert.pdf')
+        
+        assert image.size == (30, 20)
+        assert fallback == [('cert.pdf', {'dpi': 300, 'first_page': 1, 'last_page': 1})]
+    
+    def test_pdftoppm_error_falls_back_to_pdf2image(self, scanner, monkeypatch, fallback):
+        """Test that a non-zero pdftoppm exit falls back to convert_from_path."""
+        def run(args, **kwargs):
+            raise subprocess.CalledProcessError(99, args, stderr=b'Syntax Error')
+        monkeypatch.setattr(certificate_scanner.subprocess, 'run', run)
+        
+        image = scanner._pdf_to_image('cert.pdf', page=1)
+        
+        assert image.size == (30, 20)
+        assert fallback == [('cert.pdf', {'dpi': 300, 'first_page': 2, 'last_page': 2})]
+    
+    def test_empty_output_falls_back_to_pdf2image(self, scanner, monkeypatch, fallback):
+        """Test that pdftoppm succeeding without output falls back to convert_from_path."""
+        monkeypatch.setattr(
+            certificate_scanner.subprocess, 'run',
+            lambda args, **kwargs: subprocess.CompletedProcess(args, 0, stdout=b'', stderr=b'')
+        )
+        
+        assert scanner._pdf_to_image('cert.pdf').size == (30, 20)
+        assert len(fallback) == 1
+
+
+class TestSmartCertificateAligner:
+    """Test prepare/render and the output format chosen by extension."""
+    
+    @pytest.fixture
+    def aligner(self, tmp_path):
+        """Aligner for a 300x200 RGBA template with one 'name' field; returns (aligner, template)."""
+        template_path = str(tmp_path / 'template.png')
+        Image.new('RGBA', (300, 200), (255, 255, 255, 255)).save(template_path)
+        analysis = TemplateAnalysis(width=300, height=200, dpi=300, detected_fields=[
+            DetectedField(text='Name', x=0.5, y=0.5, width=0.3, height=0.1, font_size=24,
+                          color='#ff0000', alignment='center', confidence=0.9,
+                          field_type='placeholder'),
+        ])
+        return SmartCertificateAligner(analysis), template_path
+    
+    def test_render_requires_prepare(self, aligner, tmp_path):
+        """Test that render() without prepare() raises."""
+        aligner, _ = aligner
+        with pytest.raises(RuntimeError):
+            aligner.render({'name': 'Alice'}, str(tmp_path / 'out' / 'cert.png'))
+    
+    @pytest.mark.parametrize('ext, fmt', [
+        ('.png', 'PNG'), ('.jpg', 'JPEG'), ('.jpeg', 'JPEG'), ('.webp', 'WEBP'), ('.PNG', 'PNG'),
+    ])
+    def test_output_format_follows_extension(self, aligner, tmp_path, ext, fmt):
+        """Test that the extension picks the format and output is RGB."""
+        aligner, template_path = aligner
+        aligner.prepare(template_path)
+        output_path = str(tmp_path / 'out' / f'cert{ext}')
+        
+        assert aligner.render({'name': 'Alice'}, output_path) == output_path
+        
+        with Image.open(output_path) as image:
+            assert image.format == fmt
+            # The RGBA template is converted once in prepare(), so JPEG can encode it
+            assert image.mode == 'RGB'
+            # The value is drawn in the field's red
+            pixels = np.asarray(image)
+            assert ((pixels[..., 0] > 150) & (pixels[..., 1] < 100) & (pixels[..., 2] < 100)).any()
+    
+    def test_unmapped_fields_leave_template_untouched(self, aligner, tmp_path):
+        """Test that a field with no matching value is not drawn."""
+        aligner, template_path = aligner
+        aligner.prepare(template_path)
+        output_path = str(tmp_path / 'out' / 'cert.png')
+        
+        aligner.render({'email': 'alice@example.com'}, output_path)
+        
+        with Image.open(output_path) as image:
+            assert image.convert('RGB').getcolors() == [(300 * 200, (255, 255, 255))]
+    
+    def test_generate_prepares_once_per_template(self, aligner, tmp_path, monkeypatch):
+        """Test that generate_aligned_certificate decodes each template once."""
+        aligner, template_path = aligner
+        prepared = []
+        real_prepare = aligner.prepare
+        monkeypatch.setattr(aligner, 'prepare', lambda path: prepared.append(path) or real_prepare(path))
+        
+        for name in ('Alice', 'Bob'):
+            aligner.generate_aligned_certificate(
+                template_path, {'name': name}, str(tmp_path / 'out' / f'{name}.jpg')
+            )
+        
+        assert prepared == [template_path]
@@ -108,7 +108,7 @@ def export_stats():
     output_file = 'alignment_stats_export.json'
     
     with open(output_file, 'w') as f:
-        json.dump(stats.stats, f, indent=2, default=str)
+        json.dump(stats.snapshot(), f, indent=2, default=str)
     
     print(f"✅ Statistics exported to {output_file}")
 
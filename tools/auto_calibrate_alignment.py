@@ -85,8 +85,8 @@ def analyze_text_position_differences(generated_img, reference_img):
     import numpy as np
     
     # Convert to arrays
-    gen_array = np.array(generated_img.convert('RGB'))
-    ref_array = np.array(reference_img.convert('RGB'))
+    gen_array = np.asarray(generated_img.convert('RGB'))
+    ref_array = np.asarray(reference_img.convert('RGB'))
     
     # Calculate per-pixel difference
     diff_array = np.abs(gen_array.astype(int) - ref_array.astype(int))
@@ -84,7 +84,8 @@ def main():
         result = validate(
             generated_path=cert_path,
             template_ref_path=args.template,
-            tolerance_px=args.tolerance
+            tolerance_px=args.tolerance,
+            generate_overlay='always'
         )
         
         print(f"\nValidation Status: {'✅ PASS' if result['pass'] else '⚠️  NEEDS ADJUSTMENT'}")
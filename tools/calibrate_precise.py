@@ -60,7 +60,7 @@ def calibrate_field(template_path, font_path, reference_img, field_config, text)
     y_current = int(height * field_config['y'])
     
     # Find reference text center
-    ref_arr = np.array(reference_img)
+    ref_arr = np.asarray(reference_img)
     ref_y_center, ref_y_min, ref_y_max = find_text_center(ref_arr, y_current - 100, y_current + 100)
     
     if ref_y_center is None:
@@ -85,7 +85,7 @@ def calibrate_field(template_path, font_path, reference_img, field_config, text)
         test_img = _render_text_at_position(template, width, text, font, test_y, baseline_offset)
         
         # Find text center in generated image
-        gen_arr = np.array(test_img)
+        gen_arr = np.asarray(test_img)
         gen_y_center, gen_y_min, gen_y_max = find_text_center(gen_arr, int(test_y) - 80, int(test_y) + 80)
         
         if gen_y_center is not None:
@@ -103,7 +103,7 @@ def calibrate_field(template_path, font_path, reference_img, field_config, text)
             test_img = _render_text_at_position(template, width, text, font, test_y, baseline_offset)
             
             # Find text center in generated image
-            gen_arr = np.array(test_img)
+            gen_arr = np.asarray(test_img)
             gen_y_center, gen_y_min, gen_y_max = find_text_center(gen_arr, int(test_y) - 80, int(test_y) + 80)
             
             if gen_y_center is not None:
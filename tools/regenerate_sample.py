@@ -68,8 +68,8 @@ def main():
     generated_img = Image.open(cert_path)
     
     # Use numpy for efficient array comparison
-    ref_arr = np.array(reference_img)
-    gen_arr = np.array(generated_img)
+    ref_arr = np.asarray(reference_img)
+    gen_arr = np.asarray(generated_img)
     
     if np.array_equal(ref_arr, gen_arr):
         print("✅ PERFECT MATCH - Pixel-perfect alignment achieved!")
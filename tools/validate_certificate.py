@@ -69,7 +69,8 @@ Examples:
         result = validate(
             generated_path=args.generated,
             template_ref_path=args.template,
-            tolerance_px=args.tolerance
+            tolerance_px=args.tolerance,
+            generate_overlay='always'
         )
         
         # Output results